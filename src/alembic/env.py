@@ -32,6 +32,13 @@ target_metadata = Base.metadata
 config.set_section_option("alembic", "sqlalchemy.url", str(settings.db.url))
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Partitions of 'access_tokens' are created and dropped by AccessTokenReaper
+    if type_ == "table" and reflected and compare_to is None:
+        return not name.startswith("access_tokens_")
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -48,6 +55,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -57,7 +65,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
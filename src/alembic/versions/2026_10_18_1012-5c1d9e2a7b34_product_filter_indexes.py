@@ -0,0 +1,54 @@
+"""Product filter indexes
+
+Revision ID: 5c1d9e2a7b34
+Revises: 0bc51103cc2a
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d9e2a7b34"
+down_revision: Union[str, None] = "0bc51103cc2a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_products_category_id_id",
+        "products",
+        ["category_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_category_id_price_id",
+        "products",
+        ["category_id", "price", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_category_id_name_id",
+        "products",
+        ["category_id", "name", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_name_pattern",
+        "products",
+        ["name"],
+        unique=False,
+        postgresql_ops={"name": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_name_pattern", table_name="products")
+    op.drop_index("ix_products_category_id_name_id", table_name="products")
+    op.drop_index("ix_products_category_id_price_id", table_name="products")
+    op.drop_index("ix_products_category_id_id", table_name="products")
@@ -0,0 +1,45 @@
+"""Categories changed notify
+
+Revision ID: 3e7b2f4c9a10
+Revises: a83f60c2d915
+Create Date: 2026-10-18 14:03:27.091845
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e7b2f4c9a10"
+down_revision: Union[str, None] = "a83f60c2d915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOTIFY is delivered on commit, so listeners never see uncommitted changes
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_categories_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('categories_changed', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER categories_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_categories_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS categories_changed ON categories")
+    op.execute("DROP FUNCTION IF EXISTS notify_categories_changed()")
@@ -0,0 +1,58 @@
+"""Categories cascade delete
+
+Revision ID: b9d04e61f7a2
+Revises: 3e7b2f4c9a10
+Create Date: 2026-10-18 15:21:56.402917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b9d04e61f7a2"
+down_revision: Union[str, None] = "3e7b2f4c9a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint(
+        "fk_categories_parent_id_categories",
+        "categories",
+        type_="foreignkey",
+    )
+    op.create_foreign_key(
+        op.f("fk_categories_parent_id_categories"),
+        "categories",
+        "categories",
+        ["parent_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    # The cascade looks children up by 'parent_id'
+    op.create_index(
+        op.f("ix_categories_parent_id"),
+        "categories",
+        ["parent_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_categories_parent_id"), table_name="categories")
+    op.drop_constraint(
+        "fk_categories_parent_id_categories",
+        "categories",
+        type_="foreignkey",
+    )
+    op.create_foreign_key(
+        op.f("fk_categories_parent_id_categories"),
+        "categories",
+        "categories",
+        ["parent_id"],
+        ["id"],
+    )
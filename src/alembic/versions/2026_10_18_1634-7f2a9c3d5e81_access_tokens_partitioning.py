@@ -0,0 +1,142 @@
+"""Access tokens partitioning
+
+Revision ID: 7f2a9c3d5e81
+Revises: b9d04e61f7a2
+Create Date: 2026-10-18 16:34:12.518204
+
+Optional: 'access_tokens' is only partitioned when asked to with
+    alembic -x partition_access_tokens=true upgrade head
+Otherwise the revision does nothing. Applied later, it needs a downgrade
+to b9d04e61f7a2 first. Tokens that have already expired are not copied.
+
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7f2a9c3d5e81"
+down_revision: Union[str, None] = "b9d04e61f7a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def is_partitioned() -> bool:
+    relkind = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT relkind FROM pg_class WHERE oid = 'access_tokens'::regclass"
+            )
+        )
+        .scalar()
+    )
+    return relkind == "p"
+
+
+def upgrade() -> None:
+    enabled = context.get_x_argument(as_dictionary=True).get("partition_access_tokens")
+    if enabled not in ("true", "1", "yes") or is_partitioned():
+        return
+
+    op.rename_table("access_tokens", "access_tokens_unpartitioned")
+    op.execute(
+        "ALTER TABLE access_tokens_unpartitioned "
+        "RENAME CONSTRAINT pk_access_tokens TO pk_access_tokens_unpartitioned"
+    )
+    op.execute(
+        "ALTER INDEX ix_access_tokens_created_at "
+        "RENAME TO ix_access_tokens_unpartitioned_created_at"
+    )
+
+    # The partition key has to be part of the primary key
+    op.execute(
+        """
+        CREATE TABLE access_tokens (
+            user_id integer NOT NULL,
+            token varchar(43) NOT NULL,
+            created_at timestamp with time zone NOT NULL,
+            CONSTRAINT pk_access_tokens PRIMARY KEY (token, created_at),
+            CONSTRAINT fk_access_tokens_user_id_users FOREIGN KEY (user_id)
+                REFERENCES users (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index(
+        op.f("ix_access_tokens_created_at"),
+        "access_tokens",
+        ["created_at"],
+        unique=False,
+    )
+    op.execute("CREATE TABLE access_tokens_default PARTITION OF access_tokens DEFAULT")
+
+    # Daily partitions from the oldest live token, and for the next days,
+    # named and bounded the way AccessTokenReaper maintains them
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.access_token.lifetime_seconds)
+    day = cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+    last_day = now + timedelta(days=settings.access_token_reaper.partitions_ahead)
+    while day <= last_day:
+        op.execute(
+            f"CREATE TABLE access_tokens_p{day:%Y%m%d} "
+            f"PARTITION OF access_tokens FOR VALUES "
+            f"FROM ('{day.isoformat()}') "
+            f"TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+        day += timedelta(days=1)
+
+    op.execute(
+        sa.text(
+            "INSERT INTO access_tokens (user_id, token, created_at) "
+            "SELECT user_id, token, created_at FROM access_tokens_unpartitioned "
+            "WHERE created_at >= :cutoff"
+        ).bindparams(cutoff=cutoff)
+    )
+    op.drop_table("access_tokens_unpartitioned")
+
+
+def downgrade() -> None:
+    if not is_partitioned():
+        return
+
+    op.rename_table("access_tokens", "access_tokens_partitioned")
+    op.execute(
+        "ALTER TABLE access_tokens_partitioned "
+        "RENAME CONSTRAINT pk_access_tokens TO pk_access_tokens_partitioned"
+    )
+    op.execute(
+        "ALTER INDEX ix_access_tokens_created_at "
+        "RENAME TO ix_access_tokens_partitioned_created_at"
+    )
+
+    op.create_table(
+        "access_tokens",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("token", sa.String(length=43), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_access_tokens_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("token", name=op.f("pk_access_tokens")),
+    )
+    op.create_index(
+        op.f("ix_access_tokens_created_at"),
+        "access_tokens",
+        ["created_at"],
+        unique=False,
+    )
+    op.execute(
+        "INSERT INTO access_tokens (user_id, token, created_at) "
+        "SELECT user_id, token, created_at FROM access_tokens_partitioned"
+    )
+    # Drops every partition along with it
+    op.drop_table("access_tokens_partitioned")
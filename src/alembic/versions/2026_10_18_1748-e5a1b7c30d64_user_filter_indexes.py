@@ -0,0 +1,38 @@
+"""User filter indexes
+
+Revision ID: e5a1b7c30d64
+Revises: c4e8d1a6f953
+Create Date: 2026-10-18 17:48:09.264571
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a1b7c30d64"
+down_revision: Union[str, None] = "c4e8d1a6f953"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_users_registered_on"),
+        "users",
+        ["registered_on"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_users_email_lower_pattern",
+        "users",
+        [sa.text("lower(email) varchar_pattern_ops")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_lower_pattern", table_name="users")
+    op.drop_index(op.f("ix_users_registered_on"), table_name="users")
@@ -0,0 +1,113 @@
+"""Catalog versions
+
+Revision ID: 9d3f6a2b1c47
+Revises: e5a1b7c30d64
+Create Date: 2026-10-18 18:36:05.274913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3f6a2b1c47"
+down_revision: Union[str, None] = "e5a1b7c30d64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_TABLES = ("categories", "products")
+
+
+def upgrade() -> None:
+    # 'now()' is stable: the existing rows get it without a table rewrite
+    for table in CATALOG_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.TIMESTAMP(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+
+    op.create_table(
+        "catalog_versions",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            server_default="0",
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("table_name", name=op.f("pk_catalog_versions")),
+    )
+    op.execute(
+        "INSERT INTO catalog_versions (table_name) "
+        "VALUES ('categories'), ('products')"
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # A row, not a sequence: the new version becomes visible with the commit
+    # of the change, never before it. Writers of a table queue on its row
+    # until they commit. Not 'now()', the start of the transaction: a long
+    # writer committing after a short one would move Last-Modified back,
+    # and a revalidation with If-Modified-Since would get a wrong 304.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE catalog_versions
+            SET version = version + 1,
+                updated_at = greatest(updated_at, clock_timestamp())
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_set_updated_at
+            BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_bump_catalog_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_catalog_version ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_catalog_version()")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
+
+    op.drop_table("catalog_versions")
+    for table in CATALOG_TABLES:
+        op.drop_column(table, "updated_at")
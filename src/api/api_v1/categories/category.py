@@ -1,33 +1,46 @@
-from typing import Annotated, TYPE_CHECKING
+from typing import Annotated, TYPE_CHECKING, List
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     Response,
     HTTPException,
+    Query,
 )
+from pydantic import TypeAdapter
 from starlette import status
 
-from api.common import get_current_user
-from api.dependencies import crud as common_crud
-from core.helpers import db_helper
-from core.models import Category as CategoryModel
+from api.common import get_current_user, json_response
+from core.config import settings
+from core.helpers import db_helper, category_cache
+from core.helpers.category_cache import CategoryNode
 from core.schemas.category import (
     CategoryRead,
     CategoryReadList,
-    CategoryReadListWithProducts,
+    CategoryReadPageWithProducts,
+    CategoryRowPageWithProducts,
     CategoryCreate,
+    CategoryReadTree,
     SubCategoryBase,
 )
+from core.schemas.product import ProductReadPage, ProductRowPage
 
-from api.dependencies.categories import category_by_id
+from api.dependencies.categories import category_by_id, category_by_id_ro
+from api.dependencies.caching import CatalogValidators, catalog_etag
+from api.dependencies.pagination import CursorParams, cursor_params, encode_cursor
 from . import crud
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
+    from core.helpers.db_helper import ReadSession
 
 router = APIRouter()
 
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryNode])
+CATEGORY_PAGE_ADAPTER = TypeAdapter(CategoryRowPageWithProducts)
+PRODUCT_PAGE_ADAPTER = TypeAdapter(ProductRowPage)
+
 
 @router.get(
     "/",
@@ -39,6 +52,9 @@ router = APIRouter()
         status.HTTP_204_NO_CONTENT: {
             "description": "There are no categories",
         },
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Not modified since the 'If-None-Match' ETag",
+        },
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
             "description": "Internal Server Error",
         },
@@ -46,15 +62,17 @@ router = APIRouter()
 )
 async def get_all_categories(
     session: Annotated[
-        "AsyncSession",
-        Depends(db_helper.session_getter),
+        "ReadSession",
+        Depends(db_helper.reader_ro),
+    ],
+    validators: Annotated[
+        CatalogValidators,
+        Depends(catalog_etag("categories")),
     ],
 ):
     try:
-        categories = await common_crud.get_all_object(
-            session=session,
-            model=CategoryModel,
-        )
+        tree = await category_cache.get_tree(session=session)
+        categories = tree.all()
     except Exception as ex:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,17 +82,25 @@ async def get_all_categories(
     if not categories:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-    return categories
+    return json_response(
+        CATEGORY_LIST_ADAPTER,
+        categories,
+        headers=validators.headers,
+    )
 
 
 @router.get(
     "/all/",
-    response_model=CategoryReadListWithProducts,
+    response_model=CategoryReadPageWithProducts,
     status_code=status.HTTP_200_OK,
     name="categories:get all categories with products",
+    description="<h1>Get a page of categories with their first products</h1>",
     responses={
-        status.HTTP_204_NO_CONTENT: {
-            "description": "There are no categories",
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Not modified since the 'If-None-Match' ETag",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "The pagination cursor is malformed",
         },
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
             "description": "Internal Server Error",
@@ -83,11 +109,40 @@ async def get_all_categories(
 )
 async def get_all_categories_with_products(
     session: Annotated[
-        "AsyncSession",
-        Depends(db_helper.session_getter),
+        "ReadSession",
+        Depends(db_helper.reader_ro),
     ],
+    validators: Annotated[
+        CatalogValidators,
+        Depends(catalog_etag("categories", "products")),
+    ],
+    pagination: Annotated[
+        CursorParams,
+        Depends(cursor_params),
+    ],
+    products_limit: Annotated[
+        int,
+        Query(
+            ge=0,
+            le=settings.pagination.max_embedded_limit,
+            description="Maximum number of products embedded into each category.",
+        ),
+    ] = settings.pagination.default_embedded_limit,
 ):
-    return await crud.get_all_categories_with_products(session=session)
+    categories, next_cursor = await crud.get_categories_with_products(
+        session=session,
+        limit=pagination.limit,
+        products_limit=products_limit,
+        after_id=pagination.after_id,
+    )
+    return json_response(
+        CATEGORY_PAGE_ADAPTER,
+        {
+            "items": categories,
+            "next_cursor": encode_cursor(next_cursor) if next_cursor else None,
+        },
+        headers=validators.headers,
+    )
 
 
 @router.get(
@@ -107,13 +162,116 @@ async def get_all_categories_with_products(
 )
 async def get_category_by_id(
     category: Annotated[
-        "CategoryModel",
-        Depends(category_by_id),
+        "CategoryNode",
+        Depends(category_by_id_ro),
     ],
 ):
     return category
 
 
+@router.get(
+    "/{category_id}/tree/",
+    response_model=CategoryReadTree,
+    status_code=status.HTTP_200_OK,
+    name="categories:get category subtree",
+    description="<h1>Get a category with all its subcategories, nested</h1>",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "The category does not exist",
+        },
+    },
+)
+async def get_category_tree(
+    session: Annotated[
+        "ReadSession",
+        Depends(db_helper.reader_ro),
+    ],
+    category: Annotated[
+        "CategoryNode",
+        Depends(category_by_id_ro),
+    ],
+    depth: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=settings.category_tree.max_depth,
+            description="Number of levels below the category.",
+        ),
+    ] = settings.category_tree.max_depth,
+):
+    return await crud.get_category_tree(
+        session=session,
+        category_id=category.id,
+        depth=depth,
+    )
+
+
+@router.get(
+    "/{category_id}/products/",
+    response_model=ProductReadPage,
+    status_code=status.HTTP_200_OK,
+    name="categories:get category products",
+    description="<h1>Get a page of products of a category and, optionally, its subtree</h1>",
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Not modified since the 'If-None-Match' ETag",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "The pagination cursor is malformed",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "The category does not exist",
+        },
+    },
+)
+async def get_category_products(
+    session: Annotated[
+        "ReadSession",
+        Depends(db_helper.reader_ro),
+    ],
+    validators: Annotated[
+        CatalogValidators,
+        Depends(catalog_etag("categories", "products")),
+    ],
+    category: Annotated[
+        "CategoryNode",
+        Depends(category_by_id_ro),
+    ],
+    pagination: Annotated[
+        CursorParams,
+        Depends(cursor_params),
+    ],
+    recursive: Annotated[
+        bool,
+        Query(description="Include products of all subcategories."),
+    ] = False,
+    depth: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=settings.category_tree.max_depth,
+            description="Number of levels below the category, if recursive.",
+        ),
+    ] = settings.category_tree.max_depth,
+):
+    products, next_cursor = await crud.get_category_products(
+        session=session,
+        category_id=category.id,
+        recursive=recursive,
+        depth=depth,
+        limit=pagination.limit,
+        after_id=pagination.after_id,
+    )
+    return json_response(
+        PRODUCT_PAGE_ADAPTER,
+        {
+            "items": products,
+            "next_cursor": encode_cursor(next_cursor) if next_cursor else None,
+        },
+        headers=validators.headers,
+    )
+
+
 @router.post(
     "/",
     response_model=CategoryRead,
@@ -211,15 +369,74 @@ async def create_category(
 )
 async def get_category_with_subcategories(
     session: Annotated[
-        "AsyncSession",
-        Depends(db_helper.session_getter),
+        "ReadSession",
+        Depends(db_helper.reader_ro),
     ],
     category: Annotated[
-        "CategoryModel",
-        Depends(category_by_id),
+        "CategoryNode",
+        Depends(category_by_id_ro),
     ],
 ):
     return await crud.get_category_with_subcategories(
         session=session,
         category=category,
     )
+
+
+@router.delete(
+    "/{category_id}/",
+    status_code=status.HTTP_204_NO_CONTENT,
+    description="<h1>Delete a category with all its subcategories and products</h1>",
+    dependencies=[
+        get_current_user(
+            "v1",
+            superuser=True,
+        )
+    ],
+    name="categories:delete category",
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "The subtree will be deleted in the background",
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Missing token or inactive user",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not a superuser",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "The category does not exist",
+        },
+    },
+)
+async def delete_category(
+    session: Annotated[
+        "AsyncSession",
+        Depends(db_helper.session_getter),
+    ],
+    category: Annotated[
+        "CategoryNode",
+        Depends(category_by_id),
+    ],
+    background_tasks: BackgroundTasks,
+    background: Annotated[
+        bool,
+        Query(
+            description="Delete a very large subtree in batches, after the response."
+        ),
+    ] = False,
+):
+    if not background:
+        await crud.delete_category(session=session, category_id=category.id)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    async def delete_in_background():
+        async with db_helper.session_factory() as background_session:
+            await crud.delete_category_in_batches(
+                session=background_session,
+                category_id=category.id,
+                batch_size=settings.category_tree.delete_batch_size,
+            )
+
+    background_tasks.add_task(delete_in_background)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
@@ -1,39 +1,182 @@
 """Create Read Update Delete"""
 
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import select, Result
+from sqlalchemy import select, delete, func, true, Result, CTE, Integer, literal
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from starlette import status
 
-from core.models import Category
-from core.schemas.category import CategoryCreate, SubCategoryBase
+from core.helpers import category_cache
+from core.helpers.category_cache import CategoryNode
+from core.helpers.db_helper import ReadSession
+from core.models import Category, Product
+from core.schemas.category import (
+    CategoryCreate,
+    CategoryReadTree,
+    CategoryRowWithProducts,
+    SubCategoryBase,
+)
+from core.schemas.product import ProductRow
+from ..products.crud import PRODUCT_COLUMNS
 
 
-async def get_all_categories_with_products(session: AsyncSession) -> List[Category]:
-    stmt = (
-        select(Category).options(selectinload(Category.products)).order_by(Category.id)
+async def get_categories_with_products(
+    session: ReadSession,
+    limit: int,
+    products_limit: int,
+    after_id: Optional[int] = None,
+) -> Tuple[List[CategoryRowWithProducts], Optional[dict[str, Any]]]:
+    # 1st query: the page of categories, each counted through
+    # an index-only scan of 'ix_products_category_id_id'
+    product_count = (
+        select(func.count()).where(Product.category_id == Category.id).scalar_subquery()
     )
-    result: Result = await session.execute(stmt)
-    categories = result.scalars().all()
-    return list(categories)
+    stmt = select(
+        Category.id,
+        Category.name,
+        Category.description,
+        Category.parent_id,
+        product_count.label("product_count"),
+    )
+    if after_id is not None:
+        stmt = stmt.where(Category.id > after_id)
+    result: Result = await session.execute(stmt.order_by(Category.id).limit(limit + 1))
+    categories = result.all()
+
+    next_cursor = None
+    if len(categories) > limit:
+        categories = categories[:limit]
+        next_cursor = {"id": categories[-1].id}
+
+    # 2nd query: the first 'products_limit' products of every category on the page,
+    # a LATERAL top-N that reads at most that many index entries per category
+    products: dict[int, list] = {category.id: [] for category in categories}
+    if categories and products_limit:
+        page = (
+            select(Category.id).where(Category.id.in_(list(products))).subquery("page")
+        )
+        top_products = (
+            select(*PRODUCT_COLUMNS)
+            .where(Product.category_id == page.c.id)
+            .order_by(Product.id)
+            .limit(products_limit)
+            .lateral("top_products")
+        )
+        result = await session.execute(
+            select(top_products)
+            .select_from(page)
+            .join(top_products, true())
+            .order_by(top_products.c.category_id, top_products.c.id)
+        )
+        for product in result:
+            products[product.category_id].append(product._asdict())
+
+    # Keys in the field order of CategoryReadWithProduct, the order they are dumped in
+    return [
+        {
+            "name": category.name,
+            "description": category.description,
+            "parent_id": category.parent_id,
+            "id": category.id,
+            "products": products[category.id],
+            "product_count": category.product_count,
+        }
+        for category in categories
+    ], next_cursor
 
 
 async def get_category_with_subcategories(
-    session: AsyncSession,
-    category: Category,
+    session: ReadSession,
+    category: CategoryNode,
 ) -> SubCategoryBase:
-    stmt = (
-        select(Category)
-        .options(selectinload(Category.subcategories))
-        .where(Category.id == category.id)
+    tree = await category_cache.get_tree(session=session)
+    return SubCategoryBase(
+        id=category.id,
+        name=category.name,
+        description=category.description,
+        parent_id=category.parent_id,
+        subcategories=tree.children_of(category.id),
     )
-    result = await session.execute(stmt)
-    category_with_subs = result.scalar_one()
-    return SubCategoryBase.model_validate(category_with_subs)
+
+
+def subtree_cte(category_id: int, depth: Optional[int] = None) -> CTE:
+    # WITH RECURSIVE: the category itself, then its children level by level
+    subtree = (
+        select(
+            Category.id,
+            Category.name,
+            Category.description,
+            Category.parent_id,
+            literal(0, Integer).label("depth"),
+        )
+        .where(Category.id == category_id)
+        .cte("subtree", recursive=True)
+    )
+    children = select(
+        Category.id,
+        Category.name,
+        Category.description,
+        Category.parent_id,
+        (subtree.c.depth + 1).label("depth"),
+    ).join(subtree, Category.parent_id == subtree.c.id)
+    if depth is not None:
+        children = children.where(subtree.c.depth < depth)
+    return subtree.union_all(children)
+
+
+async def get_category_tree(
+    session: ReadSession,
+    category_id: int,
+    depth: int,
+) -> CategoryReadTree:
+    subtree = subtree_cte(category_id=category_id, depth=depth)
+    result: Result = await session.execute(
+        select(subtree).order_by(subtree.c.depth, subtree.c.id)
+    )
+
+    # Parents always come before their children
+    nodes: dict[int, CategoryReadTree] = {}
+    for row in result:
+        node = CategoryReadTree(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            parent_id=row.parent_id,
+        )
+        if row.depth > 0:
+            nodes[row.parent_id].subcategories.append(node)
+        nodes[node.id] = node
+
+    return nodes[category_id]
+
+
+async def get_category_products(
+    session: ReadSession,
+    category_id: int,
+    recursive: bool,
+    depth: int,
+    limit: int,
+    after_id: Optional[int] = None,
+) -> Tuple[List[ProductRow], Optional[dict[str, Any]]]:
+    stmt = select(*PRODUCT_COLUMNS)
+    if recursive:
+        subtree = subtree_cte(category_id=category_id, depth=depth)
+        stmt = stmt.where(Product.category_id.in_(select(subtree.c.id)))
+    else:
+        stmt = stmt.where(Product.category_id == category_id)
+    if after_id is not None:
+        stmt = stmt.where(Product.id > after_id)
+
+    result: Result = await session.execute(stmt.order_by(Product.id).limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = {"id": rows[-1].id}
+    return [row._asdict() for row in rows], next_cursor
 
 
 async def create_category(
@@ -86,4 +229,38 @@ async def create_category(
             },
         )
 
+    # Other workers learn about the change from the 'categories_changed' trigger
+    category_cache.invalidate()
     return category
+
+
+async def delete_category(session: AsyncSession, category_id: int) -> None:
+    # Subcategories and products of the whole subtree go with it
+    # through 'ON DELETE CASCADE', in one statement.
+    await session.execute(delete(Category).where(Category.id == category_id))
+    await session.commit()
+    category_cache.invalidate()
+
+
+async def delete_category_in_batches(
+    session: AsyncSession,
+    category_id: int,
+    batch_size: int,
+) -> None:
+    # Huge subtrees: remove products in short transactions first,
+    # so the final cascade only has categories left to delete.
+    subtree = subtree_cte(category_id=category_id)
+    batch = (
+        select(Product.id)
+        .where(Product.category_id.in_(select(subtree.c.id)))
+        .limit(batch_size)
+    )
+    while True:
+        result = await session.execute(
+            delete(Product).where(Product.id.in_(batch.scalar_subquery()))
+        )
+        await session.commit()
+        if result.rowcount < batch_size:
+            break
+
+    await delete_category(session=session, category_id=category_id)
@@ -1,23 +1,271 @@
 """Create Read Update Delete"""
 
-from typing import List
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import select, Result
+from sqlalchemy import (
+    Row,
+    select,
+    insert,
+    update,
+    delete,
+    values,
+    column,
+    Result,
+    Select,
+    REAL,
+    String,
+    and_,
+    or_,
+    func,
+    literal,
+    literal_column,
+    tuple_,
+)
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from starlette import status
 
+from api.dependencies.products import ProductFilterParams
+from core.config import settings
+from core.helpers.db_helper import ReadSession
 from core.models import Product, Category
-from core.schemas.product import ProductCreate, ProductUpdate, ProductUpdatePartial
+from core.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductUpdatePartial,
+    ProductSort,
+    ProductExportFormat,
+    ProductBulk,
+    ProductBulkItemResult,
+    ProductBulkOperation,
+    ProductRow,
+)
 
+# Fields of ProductRead, selected as plain rows for the list endpoints
+PRODUCT_COLUMNS = (
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.category_id,
+    Product.id,
+)
+
+EXPORT_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.description,
+    Product.price,
+    Product.category_id,
+)
+
+# Sort order -> (keyset column besides 'id', descending)
+PRODUCT_SORTS = {
+    ProductSort.ID: (None, False),
+    ProductSort.PRICE: (Product.price, False),
+    ProductSort.PRICE_DESC: (Product.price, True),
+    ProductSort.NAME: (Product.name, False),
+}
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={
+            "code": "INVALID_CURSOR",
+            "reason": "The pagination cursor does not match the requested sort order.",
+        },
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def filter_products_stmt(filters: ProductFilterParams) -> Select:
+    stmt = select(*PRODUCT_COLUMNS)
+    if filters.category_id is not None:
+        stmt = stmt.where(Product.category_id == filters.category_id)
+    if filters.min_price is not None:
+        stmt = stmt.where(Product.price >= filters.min_price)
+    if filters.max_price is not None:
+        stmt = stmt.where(Product.price <= filters.max_price)
+    if filters.name:
+        # A literal 'prefix%' pattern can use the 'varchar_pattern_ops' index
+        stmt = stmt.where(
+            Product.name.like(_escape_like(filters.name) + "%", escape="\\")
+        )
+    return stmt
+
+
+def paginate_products_stmt(
+    stmt: Select,
+    sort: ProductSort,
+    limit: int,
+    cursor: Optional[dict[str, Any]] = None,
+) -> Select:
+    column, descending = PRODUCT_SORTS[sort]
+
+    if column is None:
+        if cursor is not None:
+            stmt = stmt.where(Product.id > cursor["id"])
+        return stmt.order_by(Product.id).limit(limit + 1)
+
+    if cursor is not None:
+        # The redundant single-column bound lets the planner range-scan
+        # the index of the sort column, the row comparison breaks ties by 'id'.
+        value = cursor["key"]
+        if descending:
+            stmt = stmt.where(
+                and_(
+                    column <= value,
+                    tuple_(column, Product.id) < tuple_(value, cursor["id"]),
+                )
+            )
+        else:
+            stmt = stmt.where(
+                and_(
+                    column >= value,
+                    tuple_(column, Product.id) > tuple_(value, cursor["id"]),
+                )
+            )
+
+    if descending:
+        stmt = stmt.order_by(column.desc(), Product.id.desc())
+    else:
+        stmt = stmt.order_by(column, Product.id)
+    return stmt.limit(limit + 1)
+
+
+def check_products_cursor(
+    sort: ProductSort,
+    cursor: Optional[dict[str, Any]],
+) -> None:
+    if cursor is None:
+        return
+
+    column, _ = PRODUCT_SORTS[sort]
+    if cursor.get("sort", ProductSort.ID.value) != sort.value:
+        raise _invalid_cursor()
+    if column is not None:
+        expected = column.type.python_type
+        if not isinstance(cursor.get("key"), expected):
+            raise _invalid_cursor()
+
+
+def products_next_cursor(sort: ProductSort, product: Row) -> dict[str, Any]:
+    column, _ = PRODUCT_SORTS[sort]
+    values: dict[str, Any] = {"sort": sort.value, "id": product.id}
+    if column is not None:
+        values["key"] = getattr(product, column.key)
+    return values
+
+
+async def get_products(
+    session: ReadSession,
+    filters: ProductFilterParams,
+    limit: int,
+    cursor: Optional[dict[str, Any]] = None,
+) -> Tuple[List[ProductRow], Optional[dict[str, Any]]]:
+    check_products_cursor(filters.sort, cursor)
+
+    stmt = paginate_products_stmt(
+        filter_products_stmt(filters),
+        sort=filters.sort,
+        limit=limit,
+        cursor=cursor,
+    )
+    result: Result = await session.execute(stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = products_next_cursor(filters.sort, rows[-1])
+    return [row._asdict() for row in rows], next_cursor
+
+
+async def search_products(
+    session: ReadSession,
+    q: str,
+    limit: int,
+    cursor: Optional[dict[str, Any]] = None,
+) -> Tuple[List[ProductRow], Optional[dict[str, Any]]]:
+    if cursor is not None and (
+        cursor.get("sort") != "rank" or not isinstance(cursor.get("key"), float)
+    ):
+        raise _invalid_cursor()
+
+    # Full-text match over name and description (GIN on 'search_vector')
+    # or typo-tolerant trigram match over name (GIN 'gin_trgm_ops' on 'name'),
+    # both predicates are index-backed, so PostgreSQL combines them with BitmapOr.
+    ts_query = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q)
+    term = literal(q, String)
+    rank = func.greatest(
+        func.ts_rank_cd(Product.search_vector, ts_query),
+        func.word_similarity(term, Product.name),
+    ).label("rank")
+
+    stmt = select(*PRODUCT_COLUMNS, rank).where(
+        or_(
+            Product.search_vector.bool_op("@@")(ts_query),
+            term.bool_op("<%")(Product.name),
+        )
+    )
+    if cursor is not None:
+        stmt = stmt.where(
+            tuple_(rank, Product.id)
+            < tuple_(literal(cursor["key"], REAL), cursor["id"])
+        )
+    stmt = stmt.order_by(rank.desc(), Product.id.desc()).limit(limit + 1)
 
-async def get_products(session: AsyncSession) -> List[Product]:
-    stmt = select(Product).options(joinedload(Product.category)).order_by(Product.id)
     result: Result = await session.execute(stmt)
-    products = result.scalars().all()
-    return list(products)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = {"sort": "rank", "key": rows[-1].rank, "id": rows[-1].id}
+    # 'rank' is not a field of ProductRow, the serializer leaves it out
+    return [row._asdict() for row in rows], next_cursor
+
+
+def _rows_to_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(row._mapping), ensure_ascii=False) + "\n" for row in rows
+    )
+
+
+def _rows_to_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def export_products(
+    connection: AsyncConnection,
+    export_format: ProductExportFormat,
+) -> AsyncIterator[str]:
+    # Plain column tuples from a server-side cursor: neither ORM objects
+    # nor the whole result set are ever held in memory.
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .order_by(Product.id)
+        .execution_options(yield_per=settings.export.chunk_size)
+    )
+    result = await connection.stream(stmt)
+
+    if export_format is ProductExportFormat.CSV:
+        serialize = _rows_to_csv
+        yield _rows_to_csv([[column.key for column in EXPORT_COLUMNS]])
+    else:
+        serialize = _rows_to_ndjson
+
+    async for rows in result.partitions():
+        yield serialize(rows)
 
 
 async def create_product(
@@ -49,6 +297,159 @@ async def create_product(
     return product
 
 
+def _bulk_error(
+    operation: ProductBulkOperation,
+    index: int,
+    code: str,
+    reason: str,
+    product_id: Optional[int] = None,
+) -> ProductBulkItemResult:
+    return ProductBulkItemResult(
+        operation=operation,
+        index=index,
+        id=product_id,
+        detail={"code": code, "reason": reason},
+    )
+
+
+async def bulk_products(
+    session: AsyncSession,
+    bulk: ProductBulk,
+) -> List[ProductBulkItemResult]:
+    results: List[ProductBulkItemResult] = []
+
+    # One 'IN' query validates every referenced category
+    category_ids = {item.category_id for item in [*bulk.create, *bulk.update]}
+    existing_categories = set()
+    if category_ids:
+        existing_categories = set(
+            await session.scalars(
+                select(Category.id).where(Category.id.in_(category_ids))
+            )
+        )
+
+    creates, updates = [], []
+    for operation, items, valid in (
+        (ProductBulkOperation.CREATE, bulk.create, creates),
+        (ProductBulkOperation.UPDATE, bulk.update, updates),
+    ):
+        for index, item in enumerate(items):
+            if item.category_id in existing_categories:
+                valid.append((index, item))
+                continue
+            results.append(
+                _bulk_error(
+                    operation,
+                    index,
+                    code="CATEGORY_NOT_FOUND",
+                    reason=f"Category with ID: '{item.category_id}' not found.",
+                    product_id=getattr(item, "id", None),
+                )
+            )
+
+    try:
+        if creates:
+            # Multi-row 'INSERT ... RETURNING id', ids come back in input order
+            created_ids = await session.scalars(
+                insert(Product).returning(Product.id, sort_by_parameter_order=True),
+                [item.model_dump() for _, item in creates],
+            )
+            results.extend(
+                ProductBulkItemResult(
+                    operation=ProductBulkOperation.CREATE,
+                    index=index,
+                    id=product_id,
+                )
+                for (index, _), product_id in zip(creates, created_ids)
+            )
+
+        if updates:
+            # 'UPDATE products ... FROM (VALUES ...)', missing rows are not returned
+            fields = list(ProductUpdate.model_fields)
+            rows = values(
+                column("id", Product.id.type),
+                *(column(name, Product.__table__.c[name].type) for name in fields),
+                name="bulk_rows",
+            ).data(
+                [
+                    (item.id, *(getattr(item, name) for name in fields))
+                    for _, item in updates
+                ]
+            )
+            updated_ids = set(
+                await session.scalars(
+                    update(Product)
+                    .where(Product.id == rows.c.id)
+                    .values({name: rows.c[name] for name in fields})
+                    .returning(Product.id)
+                    .execution_options(synchronize_session=False)
+                )
+            )
+            for index, item in updates:
+                if item.id in updated_ids:
+                    results.append(
+                        ProductBulkItemResult(
+                            operation=ProductBulkOperation.UPDATE,
+                            index=index,
+                            id=item.id,
+                        )
+                    )
+                    continue
+                results.append(
+                    _bulk_error(
+                        ProductBulkOperation.UPDATE,
+                        index,
+                        code="PRODUCT_NOT_FOUND",
+                        reason=f"Product ID: '{item.id}' was not found.",
+                        product_id=item.id,
+                    )
+                )
+
+        if bulk.delete:
+            deleted_ids = set(
+                await session.scalars(
+                    delete(Product)
+                    .where(Product.id.in_(bulk.delete))
+                    .returning(Product.id)
+                    .execution_options(synchronize_session=False)
+                )
+            )
+            for index, product_id in enumerate(bulk.delete):
+                if product_id in deleted_ids:
+                    results.append(
+                        ProductBulkItemResult(
+                            operation=ProductBulkOperation.DELETE,
+                            index=index,
+                            id=product_id,
+                        )
+                    )
+                    continue
+                results.append(
+                    _bulk_error(
+                        ProductBulkOperation.DELETE,
+                        index,
+                        code="PRODUCT_NOT_FOUND",
+                        reason=f"Product ID: '{product_id}' was not found.",
+                        product_id=product_id,
+                    )
+                )
+
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INTEGRITY_ERROR",
+                "reason": "Error applying bulk changes, nothing was saved.",
+            },
+        )
+
+    order = list(ProductBulkOperation)
+    results.sort(key=lambda result: (order.index(result.operation), result.index))
+    return results
+
+
 async def update_product(
     session: AsyncSession,
     product: Product,
@@ -1,43 +1,225 @@
 from typing import Annotated, TYPE_CHECKING, List
 
-from fastapi import APIRouter, Depends, status
+from asyncpg import PostgresError
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.exc import DBAPIError
 
-from api.common import get_current_user
-from api.dependencies import crud as crud_common
+from api.common import get_current_user, json_response
 from core.models import Product as ProductModel
-from core.helpers import db_helper
+from core.helpers import db_helper, import_products_helper
 from core.schemas.product import (
+    ProductBulk,
+    ProductBulkResult,
     ProductCreate,
+    ProductImportResult,
     ProductRead,
-    ProductReadList,
+    ProductReadPage,
+    ProductRow,
+    ProductRowPage,
+    ProductSort,
+    ProductExportFormat,
     ProductUpdate,
     ProductUpdatePartial,
 )
 
-from api.dependencies.products import product_by_id
+from api.dependencies.pagination import CursorParams, cursor_params, encode_cursor
+from api.dependencies.caching import CatalogValidators, catalog_etag
+from api.dependencies.products import (
+    product_by_id,
+    product_by_id_ro,
+    ProductFilterParams,
+    product_filter_params,
+)
 from . import crud
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
+    from core.helpers.db_helper import ReadSession
     from core.models import User as UserModel
 
 
 router = APIRouter()
 
+EXPORT_MEDIA_TYPES = {
+    ProductExportFormat.NDJSON: "application/x-ndjson",
+    ProductExportFormat.CSV: "text/csv",
+}
+IMPORT_CHUNK_SIZE = 1 << 20
+PRODUCT_PAGE_ADAPTER = TypeAdapter(ProductRowPage)
+
 
 @router.get(
     "/",
-    response_model=ProductReadList,
+    response_model=ProductReadPage,
     status_code=status.HTTP_200_OK,
     name="products:get all products",
+    description="<h1>Get a filtered and sorted page of products</h1>",
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Not modified since the 'If-None-Match' ETag",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid price range or pagination cursor",
+        },
+    },
 )
 async def get_all_products(
     session: Annotated[
-        "AsyncSession",
-        Depends(db_helper.session_getter),
-    ]
+        "ReadSession",
+        Depends(db_helper.reader_ro),
+    ],
+    validators: Annotated[
+        CatalogValidators,
+        Depends(catalog_etag("products")),
+    ],
+    pagination: Annotated[
+        CursorParams,
+        Depends(cursor_params),
+    ],
+    filters: Annotated[
+        ProductFilterParams,
+        Depends(product_filter_params),
+    ],
+):
+    cursor = pagination.cursor
+    if cursor is None and pagination.after_id is not None:
+        if filters.sort is not ProductSort.ID:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "code": "INVALID_CURSOR",
+                    "reason": "'after_id' can only be used with 'sort=id', use 'cursor' instead.",
+                },
+            )
+        cursor = {"id": pagination.after_id}
+
+    products, next_cursor = await crud.get_products(
+        session=session,
+        filters=filters,
+        limit=pagination.limit,
+        cursor=cursor,
+    )
+    return json_response(
+        PRODUCT_PAGE_ADAPTER,
+        {
+            "items": products,
+            "next_cursor": encode_cursor(next_cursor) if next_cursor else None,
+        },
+        headers=validators.headers,
+    )
+
+
+@router.get(
+    "/search/",
+    response_model=ProductReadPage,
+    status_code=status.HTTP_200_OK,
+    name="products:search products",
+    description="<h1>Search products by name and description, best matches first</h1>",
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Not modified since the 'If-None-Match' ETag",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "The pagination cursor is malformed",
+        },
+    },
+)
+async def search_products(
+    session: Annotated[
+        "ReadSession",
+        Depends(db_helper.reader_ro),
+    ],
+    validators: Annotated[
+        CatalogValidators,
+        Depends(catalog_etag("products")),
+    ],
+    pagination: Annotated[
+        CursorParams,
+        Depends(cursor_params),
+    ],
+    q: Annotated[
+        str,
+        Query(
+            min_length=2,
+            max_length=128,
+            description="Search phrase, typos in product names are tolerated.",
+        ),
+    ],
 ):
-    return await crud_common.get_all_object(session=session, model=ProductModel)
+    if pagination.cursor is None and pagination.after_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INVALID_CURSOR",
+                "reason": "Search results are ranked, use 'cursor' instead of 'after_id'.",
+            },
+        )
+
+    products, next_cursor = await crud.search_products(
+        session=session,
+        q=q,
+        limit=pagination.limit,
+        cursor=pagination.cursor,
+    )
+    return json_response(
+        PRODUCT_PAGE_ADAPTER,
+        {
+            "items": products,
+            "next_cursor": encode_cursor(next_cursor) if next_cursor else None,
+        },
+        headers=validators.headers,
+    )
+
+
+@router.get(
+    "/export/",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    name="products:export products",
+    description="<h1>Stream the whole product catalog as NDJSON or CSV</h1>",
+    responses={
+        status.HTTP_200_OK: {
+            "content": {
+                EXPORT_MEDIA_TYPES[ProductExportFormat.NDJSON]: {},
+                EXPORT_MEDIA_TYPES[ProductExportFormat.CSV]: {},
+            },
+        },
+    },
+)
+async def export_products(
+    request: Request,
+    export_format: Annotated[
+        ProductExportFormat,
+        Query(alias="format", description="File format of the export."),
+    ] = ProductExportFormat.NDJSON,
+):
+    async def content():
+        # The connection must outlive the handler, it is closed
+        # only when the last chunk has been sent.
+        async with db_helper.read_connection(request) as connection:
+            async for chunk in crud.export_products(
+                connection=connection,
+                export_format=export_format,
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="products.{export_format.value}"',
+        },
+    )
 
 
 @router.get(
@@ -47,8 +229,8 @@ async def get_all_products(
 )
 async def get_product_by_id(
     product: Annotated[
-        "ProductModel",
-        Depends(product_by_id),
+        "ProductRow",
+        Depends(product_by_id_ro),
     ]
 ):
     return product
@@ -77,6 +259,92 @@ async def create_product(
     )
 
 
+@router.post(
+    "/bulk/",
+    response_model=ProductBulkResult,
+    status_code=status.HTTP_200_OK,
+    name="products:bulk create update delete",
+    description="<h1>Create, update and delete products in one transaction</h1>",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Nothing was saved because of an integrity error",
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Missing token or inactive user",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not a superuser",
+        },
+    },
+)
+async def bulk_products(
+    current_user: Annotated[
+        "UserModel",
+        get_current_user("v1", superuser=True),
+    ],
+    session: Annotated[
+        "AsyncSession",
+        Depends(db_helper.session_getter),
+    ],
+    schema: ProductBulk,
+):
+    results = await crud.bulk_products(
+        session=session,
+        bulk=schema,
+    )
+    return ProductBulkResult(results=results)
+
+
+@router.post(
+    "/import/",
+    response_model=ProductImportResult,
+    status_code=status.HTTP_200_OK,
+    name="products:import products",
+    description="<h1>Import a CSV product catalog</h1>"
+    "<p>Header: <code>id,name,description,price,category_id</code>, 'id' is optional. "
+    "Rows with an 'id' replace the existing product.</p>",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "The file is malformed, nothing was imported",
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Missing token or inactive user",
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not a superuser",
+        },
+    },
+)
+async def import_products(
+    current_user: Annotated[
+        "UserModel",
+        get_current_user("v1", superuser=True),
+    ],
+    session: Annotated[
+        "AsyncSession",
+        Depends(db_helper.session_getter),
+    ],
+    file: UploadFile,
+):
+    async def content():
+        while chunk := await file.read(IMPORT_CHUNK_SIZE):
+            yield chunk
+
+    try:
+        result = await import_products_helper(session=session, source=content())
+    except (ValueError, DBAPIError, PostgresError) as ex:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "IMPORT_ERROR",
+                "reason": str(getattr(ex, "orig", None) or ex),
+            },
+        )
+
+    return result
+
+
 @router.put("/{product_id}")
 async def update_product(
     current_user: Annotated[
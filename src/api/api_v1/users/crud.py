@@ -0,0 +1,76 @@
+"""Create Read Update Delete"""
+
+from typing import List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, func
+
+from api.dependencies import crud as common_crud
+from api.dependencies.users import UserFilterParams
+from core.helpers.db_helper import ReadSession
+from core.models import User
+from core.schemas.user import UserRow
+
+# Fields of UserRead, selected as plain rows for the list endpoint
+USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.is_active,
+    User.is_superuser,
+    User.is_verified,
+    User.username,
+    User.first_name,
+    User.last_name,
+    User.middle_name,
+    User.birth_date,
+    User.registered_on,
+)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def filter_users(filters: UserFilterParams) -> List[ColumnElement[bool]]:
+    clauses = []
+    if filters.is_active is not None:
+        clauses.append(User.is_active.is_(filters.is_active))
+    if filters.is_verified is not None:
+        clauses.append(User.is_verified.is_(filters.is_verified))
+    if filters.is_superuser is not None:
+        clauses.append(User.is_superuser.is_(filters.is_superuser))
+    if filters.registered_from is not None:
+        clauses.append(User.registered_on >= filters.registered_from)
+    if filters.registered_to is not None:
+        clauses.append(User.registered_on < filters.registered_to)
+    if filters.email is not None:
+        # Served by 'ix_users_email_lower_pattern'
+        clauses.append(
+            func.lower(User.email).like(
+                _escape_like(filters.email.lower()) + "%",
+                escape="\\",
+            )
+        )
+    return clauses
+
+
+async def get_users(
+    session: ReadSession,
+    filters: UserFilterParams,
+    limit: int,
+    after_id: Optional[int] = None,
+) -> Tuple[List[UserRow], Optional[int], Optional[int]]:
+    clauses = filter_users(filters)
+    users, last_id = await common_crud.get_page_rows(
+        session=session,
+        columns=USER_COLUMNS,
+        id_column=User.id,
+        limit=limit,
+        after_id=after_id,
+        filters=clauses,
+    )
+    total_estimate = await common_crud.estimate_count(
+        session=session,
+        model=User,
+        filters=clauses,
+    )
+    return users, last_id, total_estimate
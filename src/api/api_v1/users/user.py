@@ -1,26 +1,34 @@
 from typing import Annotated, TYPE_CHECKING
 
 from fastapi import APIRouter, Depends
+from pydantic import TypeAdapter
 from starlette import status
 
-from api.common import get_current_user
-from api.dependencies import crud as common_crud
+from api.common import get_current_user, json_response
+from api.dependencies.pagination import CursorParams, cursor_params, encode_cursor
+from api.dependencies.users import UserFilterParams, user_filter_params
 from core.helpers import db_helper
 from core.models import User as UserModel
-from core.schemas.user import UserReadList
+from core.schemas.user import UserReadPage, UserRowPage
+from . import crud
 
 if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncSession
+    from core.helpers.db_helper import ReadSession
 router = APIRouter()
 
+USER_PAGE_ADAPTER = TypeAdapter(UserRowPage)
+
 
 @router.get(
     "/",
     name="users:get all users",
     status_code=status.HTTP_200_OK,
-    response_model=UserReadList,
-    description="<h1>Get a list of all users</h1>",
+    response_model=UserReadPage,
+    description="<h1>Get a filtered page of users</h1>",
     responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Invalid date range or pagination cursor",
+        },
         status.HTTP_401_UNAUTHORIZED: {
             "description": "Missing token or inactive user",
         },
@@ -38,8 +46,31 @@ async def get_all_users(
         get_current_user("v1", superuser=True),
     ],
     session: Annotated[
-        "AsyncSession",
-        Depends(db_helper.session_getter),
+        "ReadSession",
+        Depends(db_helper.reader),
+    ],
+    pagination: Annotated[
+        CursorParams,
+        Depends(cursor_params),
+    ],
+    filters: Annotated[
+        UserFilterParams,
+        Depends(user_filter_params),
     ],
 ):
-    return await common_crud.get_all_object(session=session, model=UserModel)
+    users, last_id, total_estimate = await crud.get_users(
+        session=session,
+        filters=filters,
+        limit=pagination.limit,
+        after_id=pagination.after_id,
+    )
+    return json_response(
+        USER_PAGE_ADAPTER,
+        {
+            "items": users,
+            "next_cursor": (
+                encode_cursor({"id": last_id}) if last_id is not None else None
+            ),
+            "total_estimate": total_estimate,
+        },
+    )
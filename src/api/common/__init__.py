@@ -1,7 +1,10 @@
 __all__ = (
     "get_auth_router",
     "get_current_user",
+    "JSONBytesResponse",
+    "json_response",
 )
 
 from .auth_router_factory import get_auth_router
 from .current_user_factory import get_current_user
+from .json_response import JSONBytesResponse, json_response
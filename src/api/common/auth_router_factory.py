@@ -1,11 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi_users import FastAPIUsers
 
 from core.models import User
 from core.types.user_id import UserIdType
 from core.schemas.user import UserCreate, UserUpdate, UserRead
 
-from api.dependencies.authentication import get_authentication_backend, get_user_manager
+from api.dependencies.authentication import (
+    get_authentication_backend,
+    get_user_manager,
+    rate_limit,
+)
 
 
 def get_auth_router(version_api: str) -> APIRouter:
@@ -36,6 +40,7 @@ def get_auth_router(version_api: str) -> APIRouter:
             authentication_backend,
             requires_verification=True,
         ),
+        dependencies=[Depends(rate_limit("login"))],
     )
 
     # /me
@@ -50,6 +55,7 @@ def get_auth_router(version_api: str) -> APIRouter:
     # /register
     router.include_router(
         fastapi_users.get_register_router(UserRead, UserCreate),
+        dependencies=[Depends(rate_limit("register"))],
     )
 
     # /request-verify-token
@@ -62,6 +68,7 @@ def get_auth_router(version_api: str) -> APIRouter:
     # /reset-password
     router.include_router(
         fastapi_users.get_reset_password_router(),
+        dependencies=[Depends(rate_limit("forgot-password"))],
     )
 
     return router
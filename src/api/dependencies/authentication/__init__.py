@@ -1,7 +1,9 @@
 __all__ = (
     "get_authentication_backend",
     "get_user_manager",
+    "rate_limit",
 )
 
 from .auth_strategy_factory import get_authentication_backend
 from .user_manager import get_user_manager
+from .rate_limit import rate_limit
@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING, Annotated
 
 from fastapi import Depends
 
+from core.authentication.access_token_cache import access_token_cache
 from core.models import AccessToken
 from core.helpers import db_helper
 
@@ -15,4 +16,4 @@ async def get_access_tokens_db(
         Depends(db_helper.session_getter),
     ]
 ):
-    yield AccessToken.get_db(session=session)
+    yield AccessToken.get_db(session=session, cache=access_token_cache)
@@ -0,0 +1,75 @@
+import math
+from json import JSONDecodeError
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from core.config import settings
+from core.helpers import rate_limiter
+
+
+def client_ip(request: Request) -> str:
+    if settings.rate_limit.trust_forwarded_for:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def request_email(request: Request) -> Optional[str]:
+    # The body is already parsed by the route and cached on the request
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            data = await request.json()
+            email = data.get("email") if isinstance(data, dict) else None
+        else:
+            # OAuth2 login form
+            email = (await request.form()).get("username")
+    except (JSONDecodeError, UnicodeDecodeError, AssertionError):
+        return None
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return email.strip().lower()
+
+
+def rate_limit(action: str):
+    """Dependency throttling the '/{action}' route by client IP and by e-mail"""
+
+    async def dependency(request: Request) -> None:
+        config = settings.rate_limit
+        if not config.enabled:
+            return
+        # Given to a whole fastapi-users router, the other routes pass through
+        route = request.scope.get("route")
+        if route is not None and not route.path.endswith(f"/{action}"):
+            return
+
+        limits = [
+            (
+                f"{action}:ip:{client_ip(request)}",
+                config.ip_burst,
+                config.ip_per_minute / 60,
+            )
+        ]
+        email = await request_email(request)
+        if email is not None:
+            limits.append(
+                (
+                    f"{action}:email:{email}",
+                    config.email_burst,
+                    config.email_per_minute / 60,
+                )
+            )
+
+        retry_after = await rate_limiter.hit(*limits)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "code": "TOO_MANY_REQUESTS",
+                    "reason": f"Too many {action} attempts, retry later",
+                },
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    return dependency
@@ -1,8 +1,15 @@
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Annotated
 
 from fastapi import Depends
+from fastapi_users import exceptions
 from fastapi_users.authentication.strategy.db import DatabaseStrategy
 
+from core.authentication.token_cache import (
+    UserSnapshot,
+    token_digest,
+    verified_token_cache,
+)
 from core.config import settings
 from .access_tokens import get_access_tokens_db
 
@@ -11,13 +18,51 @@ if TYPE_CHECKING:
     from fastapi_users.authentication.strategy.db import AccessTokenDatabase
 
 
+class CachedDatabaseStrategy(DatabaseStrategy):
+    """DatabaseStrategy serving the user of a known token from memory"""
+
+    async def read_token(self, token, user_manager):
+        if token is None:
+            return None
+
+        max_age = None
+        if self.lifetime_seconds:
+            max_age = datetime.now(timezone.utc) - timedelta(
+                seconds=self.lifetime_seconds
+            )
+
+        # Served by the access token cache while its listener is up
+        access_token = await self.database.get_by_token(token, max_age)
+        if access_token is None:
+            return None
+
+        digest = token_digest(token)
+        snapshot = verified_token_cache.get(digest)
+        if snapshot is not None and snapshot.user_id == access_token.user_id:
+            return await snapshot.to_user(user_manager.user_db.session)
+
+        try:
+            parsed_id = user_manager.parse_id(access_token.user_id)
+            user = await user_manager.get(parsed_id)
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        expires_at = None
+        if self.lifetime_seconds:
+            expires_at = (
+                access_token.created_at + timedelta(seconds=self.lifetime_seconds)
+            ).timestamp()
+        verified_token_cache.set(digest, UserSnapshot.of(user), expires_at=expires_at)
+        return user
+
+
 def get_database_strategy(
     access_tokens_db: Annotated[
         "AccessTokenDatabase[AccessToken]",
         Depends(get_access_tokens_db),
     ]
 ) -> DatabaseStrategy:
-    return DatabaseStrategy(
+    return CachedDatabaseStrategy(
         database=access_tokens_db,
         lifetime_seconds=settings.access_token.lifetime_seconds,
     )
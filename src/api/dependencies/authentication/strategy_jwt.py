@@ -1,12 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import jwt
+from fastapi_users import exceptions
 from fastapi_users.authentication import JWTStrategy
 
+from core.authentication.jwt_keys import JWTKeyManager, jwt_keys
+from core.authentication.token_cache import (
+    UserSnapshot,
+    token_digest,
+    verified_token_cache,
+)
 from core.config import settings
 
 
+class KeyedJWTStrategy(JWTStrategy):
+    """JWTStrategy on pre-parsed keys, with a 'kid' header for key rotation"""
+
+    def __init__(
+        self,
+        keys: JWTKeyManager,
+        lifetime_seconds: Optional[int],
+        algorithm: str,
+    ) -> None:
+        super().__init__(
+            secret="",
+            lifetime_seconds=lifetime_seconds,
+            algorithm=algorithm,
+        )
+        self.keys = keys
+
+    def decode_token(self, token: str) -> Optional[dict[str, Any]]:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            public_key = self.keys.public_key(kid)
+            if public_key is None:
+                return None
+            return jwt.decode(
+                token,
+                public_key,
+                audience=self.token_audience,
+                algorithms=[self.algorithm],
+            )
+        except jwt.PyJWTError:
+            return None
+
+    async def read_token(self, token, user_manager):
+        if token is None:
+            return None
+
+        # A token seen before skips both the signature check and the user lookup
+        digest = token_digest(token)
+        snapshot = verified_token_cache.get(digest)
+        if snapshot is not None:
+            return await snapshot.to_user(user_manager.user_db.session)
+
+        data = self.decode_token(token)
+        if data is None or data.get("sub") is None:
+            return None
+
+        try:
+            parsed_id = user_manager.parse_id(data["sub"])
+            user = await user_manager.get(parsed_id)
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+        verified_token_cache.set(
+            digest,
+            UserSnapshot.of(user),
+            expires_at=data.get("exp"),
+        )
+        return user
+
+    async def write_token(self, user) -> str:
+        key = self.keys.current
+        payload = {"sub": str(user.id), "aud": self.token_audience}
+        if self.lifetime_seconds:
+            payload["exp"] = datetime.now(timezone.utc) + timedelta(
+                seconds=self.lifetime_seconds
+            )
+        return jwt.encode(
+            payload,
+            key.private_key,
+            algorithm=self.algorithm,
+            headers={"kid": key.kid},
+        )
+
+
+# Built once: the keys are parsed on startup, not on every request
+jwt_strategy = KeyedJWTStrategy(
+    keys=jwt_keys,
+    lifetime_seconds=settings.auth_jwt.access_token_expire_minutes,
+    algorithm=settings.auth_jwt.algorithm,
+)
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(
-        secret=settings.auth_jwt.private_key_path.read_text(),
-        lifetime_seconds=settings.auth_jwt.access_token_expire_minutes,
-        algorithm=settings.auth_jwt.algorithm,
-        public_key=settings.auth_jwt.public_key_path.read_text(),
-    )
+    return jwt_strategy
@@ -2,6 +2,7 @@ from typing import Annotated, TYPE_CHECKING
 
 from fastapi import Depends
 
+from core.authentication.password_hashing import password_helper
 from core.authentication.user_manager import UserManager
 from .users import get_users_db
 
@@ -15,4 +16,4 @@ async def get_user_manager(
         Depends(get_users_db),
     ],
 ):
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_helper)
@@ -0,0 +1,6 @@
+__all__ = (
+    "CatalogValidators",
+    "catalog_etag",
+)
+
+from .catalog_etag import CatalogValidators, catalog_etag
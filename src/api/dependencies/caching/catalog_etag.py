@@ -0,0 +1,98 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Annotated, Optional
+
+from fastapi import Depends, HTTPException, Request, status
+
+from core import queries
+from core.helpers import db_helper
+from core.helpers.db_helper import ReadSession
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogValidators:
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        # Cached by clients, but revalidated on every use
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison: a compressed response carries the weak form of the tag
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have a one second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def catalog_etag(*tables: str):
+    """Dependency answering '304 Not Modified' when none of the catalog
+    'tables' changed since the client's copy, before any row is read.
+
+    The ETag hashes the URL with the 'catalog_versions' of the tables.
+    Read before the rows, it can only be older than the data it is sent
+    with, so a client may refetch an unchanged page but never keeps a
+    stale one.
+    """
+
+    async def dependency(
+        request: Request,
+        session: Annotated[
+            ReadSession,
+            Depends(db_helper.reader_ro),
+        ],
+    ) -> CatalogValidators:
+        result = await session.execute(queries.catalog_versions(tables))
+        versions = result.all()
+
+        key = "|".join(
+            [
+                str(request.url.path),
+                request.url.query,
+                *sorted(f"{row.table_name}:{row.version}" for row in versions),
+            ]
+        )
+        validators = CatalogValidators(
+            etag=f'"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"',
+            last_modified=max((row.updated_at for row in versions), default=None),
+        )
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            # Takes precedence over If-Modified-Since
+            not_modified = etag_matches(if_none_match, validators.etag)
+        elif if_modified_since is not None and validators.last_modified is not None:
+            not_modified = not_modified_since(
+                if_modified_since, validators.last_modified
+            )
+        else:
+            not_modified = False
+
+        if not_modified:
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=validators.headers,
+            )
+        return validators
+
+    return dependency
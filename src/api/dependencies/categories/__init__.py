@@ -1,3 +1,6 @@
-__all__ = ("category_by_id",)
+__all__ = (
+    "category_by_id",
+    "category_by_id_ro",
+)
 
-from .by_id import category_by_id
+from .by_id import category_by_id, category_by_id_ro
@@ -1,19 +1,18 @@
-from typing import Annotated
+from typing import Annotated, Union
 from fastapi import Depends, HTTPException, status, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import Category
-from core.helpers import db_helper
+from core.helpers import db_helper, category_cache
+from core.helpers.category_cache import CategoryNode
+from core.helpers.db_helper import ReadSession
 
 
-async def category_by_id(
-    category_id: Annotated[int, Path(..., gt=0)],
-    session: Annotated[
-        AsyncSession,
-        Depends(db_helper.session_getter),
-    ],
-) -> Category:
-    category = await session.get(Category, category_id)
+async def get_category(
+    session: Union[AsyncSession, ReadSession],
+    category_id: int,
+) -> CategoryNode:
+    tree = await category_cache.get_tree(session=session)
+    category = tree.get(category_id)
     if category:
         return category
 
@@ -21,3 +20,23 @@ async def category_by_id(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Category with ID: '{category_id}' not found.",
     )
+
+
+async def category_by_id(
+    category_id: Annotated[int, Path(..., gt=0)],
+    session: Annotated[
+        AsyncSession,
+        Depends(db_helper.session_getter),
+    ],
+) -> CategoryNode:
+    return await get_category(session=session, category_id=category_id)
+
+
+async def category_by_id_ro(
+    category_id: Annotated[int, Path(..., gt=0)],
+    session: Annotated[
+        ReadSession,
+        Depends(db_helper.reader_ro),
+    ],
+) -> CategoryNode:
+    return await get_category(session=session, category_id=category_id)
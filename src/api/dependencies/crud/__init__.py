@@ -1,3 +1,7 @@
-__all__ = ("get_all_object",)
+__all__ = (
+    "get_page_rows",
+    "estimate_count",
+)
 
-from .get_all_object import get_all_object
+from .get_page_rows import get_page_rows
+from .estimate_count import estimate_count
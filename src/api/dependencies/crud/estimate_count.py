@@ -0,0 +1,46 @@
+from typing import Type, TypeVar, Optional, Sequence
+
+from sqlalchemy import select, text, ColumnElement, Select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from core.helpers.db_helper import ReadSession
+
+T = TypeVar("T", bound=DeclarativeBase)
+
+
+class Explain(Executable, ClauseElement):
+    """'EXPLAIN (FORMAT JSON)' of a statement, with its bound parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_count(
+    session: ReadSession,
+    model: Type[T],
+    filters: Sequence[ColumnElement[bool]] = (),
+) -> Optional[int]:
+    # Planner statistics instead of 'COUNT(*)', which reads the whole table:
+    # 'pg_class.reltuples' for the table, the row estimate of the plan with filters.
+    if not filters:
+        reltuples = await session.scalar(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)"),
+            {"name": model.__tablename__},
+        )
+        # -1 until the table is vacuumed or analyzed for the first time
+        if reltuples is not None and reltuples >= 0:
+            return int(reltuples)
+
+    plan = await session.scalar(Explain(select(model.id).where(*filters)))
+    if not plan:
+        return None
+    return int(plan[0]["Plan"]["Plan Rows"])
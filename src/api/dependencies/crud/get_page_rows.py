@@ -0,0 +1,30 @@
+from typing import Any, List, Optional, Tuple, Sequence
+
+from sqlalchemy import select, Result, ColumnElement
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core.helpers.db_helper import ReadSession
+
+
+async def get_page_rows(
+    session: ReadSession,
+    columns: Sequence[InstrumentedAttribute],
+    id_column: InstrumentedAttribute[int],
+    limit: int,
+    after_id: Optional[int] = None,
+    filters: Sequence[ColumnElement[bool]] = (),
+) -> Tuple[List[dict[str, Any]], Optional[int]]:
+    # Keyset pagination over plain rows instead of ORM instances:
+    # no identity map, no attribute instrumentation.
+    stmt = select(*columns).where(*filters).order_by(id_column).limit(limit + 1)
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+
+    result: Result = await session.execute(stmt)
+    rows = result.all()
+
+    last_id = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_id = rows[-1]._mapping[id_column]
+    return [row._asdict() for row in rows], last_id
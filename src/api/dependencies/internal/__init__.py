@@ -0,0 +1,3 @@
+__all__ = ("internal_network",)
+
+from .internal_network import internal_network
@@ -0,0 +1,21 @@
+import ipaddress
+
+from fastapi import HTTPException, Request, status
+
+from core.config import settings
+
+
+def internal_network(request: Request) -> None:
+    """Hides the internal routes from clients outside 'allowed_networks'"""
+    try:
+        address = ipaddress.ip_address(request.client.host if request.client else "")
+    except ValueError:
+        address = None
+
+    if address is None or not any(
+        address in network for network in settings.internal.allowed_networks
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
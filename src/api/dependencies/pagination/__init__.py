@@ -0,0 +1,8 @@
+__all__ = (
+    "CursorParams",
+    "cursor_params",
+    "encode_cursor",
+    "decode_cursor",
+)
+
+from .cursor import CursorParams, cursor_params, encode_cursor, decode_cursor
@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Annotated, Any, Optional
+
+from fastapi import HTTPException, Query, status
+
+from core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class CursorParams:
+    limit: int
+    after_id: Optional[int] = None
+    # Decoded keyset values of the opaque cursor, if one was passed
+    cursor: Optional[dict[str, Any]] = None
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    # The cursor is opaque for clients: urlsafe base64 of the keyset values
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        values = None
+
+    if not isinstance(values, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INVALID_CURSOR",
+                "reason": "The pagination cursor is malformed.",
+            },
+        )
+    return values
+
+
+def cursor_params(
+    limit: Annotated[
+        int,
+        Query(
+            ge=1,
+            le=settings.pagination.max_limit,
+            description="Maximum number of objects on the page.",
+        ),
+    ] = settings.pagination.default_limit,
+    after_id: Annotated[
+        Optional[int],
+        Query(
+            gt=0,
+            description="Return objects with ID greater than this one.",
+        ),
+    ] = None,
+    cursor: Annotated[
+        Optional[str],
+        Query(
+            description="Opaque cursor from 'next_cursor' of the previous page. "
+            "Takes precedence over 'after_id'.",
+        ),
+    ] = None,
+) -> CursorParams:
+    if cursor is None:
+        return CursorParams(limit=limit, after_id=after_id)
+
+    values = decode_cursor(cursor)
+    after_id = values.get("id")
+    if not isinstance(after_id, int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INVALID_CURSOR",
+                "reason": "The pagination cursor is malformed.",
+            },
+        )
+
+    return CursorParams(limit=limit, after_id=after_id, cursor=values)
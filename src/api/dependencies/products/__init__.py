@@ -1,3 +1,9 @@
-__all__ = ("product_by_id",)
+__all__ = (
+    "product_by_id",
+    "product_by_id_ro",
+    "ProductFilterParams",
+    "product_filter_params",
+)
 
-from .by_id import product_by_id
+from .by_id import product_by_id, product_by_id_ro
+from .filters import ProductFilterParams, product_filter_params
@@ -2,8 +2,34 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core import queries
 from core.models import Product
 from core.helpers import db_helper
+from core.helpers.db_helper import ReadSession
+from core.schemas.product import ProductRow
+
+
+def _not_found(product_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Product ID: '{product_id}' was not found.",
+    )
+
+
+async def get_product(session: AsyncSession, product_id: int) -> Product:
+    result = await session.execute(queries.object_by_id(Product, product_id))
+    product = result.scalar_one_or_none()
+    if product:
+        return product
+    raise _not_found(product_id)
+
+
+async def get_product_row(session: ReadSession, product_id: int) -> ProductRow:
+    result = await session.execute(queries.product_row_by_id(product_id))
+    product = result.first()
+    if product:
+        return product._asdict()
+    raise _not_found(product_id)
 
 
 async def product_by_id(
@@ -13,11 +39,14 @@ async def product_by_id(
         Depends(db_helper.session_getter),
     ],
 ) -> Product:
-    product = await session.get(Product, product_id)
-    if product:
-        return product
+    return await get_product(session=session, product_id=product_id)
 
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail=f"Product ID: '{product_id}' was not found.",
-    )
+
+async def product_by_id_ro(
+    product_id: Annotated[int, Path(..., gt=0)],
+    session: Annotated[
+        ReadSession,
+        Depends(db_helper.reader_ro),
+    ],
+) -> ProductRow:
+    return await get_product_row(session=session, product_id=product_id)
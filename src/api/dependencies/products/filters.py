@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Annotated, Optional
+
+from fastapi import HTTPException, Query, status
+
+from core.schemas.product import ProductSort
+
+
+@dataclass(frozen=True, slots=True)
+class ProductFilterParams:
+    category_id: Optional[int] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    name: Optional[str] = None
+    sort: ProductSort = ProductSort.ID
+
+
+def product_filter_params(
+    category_id: Annotated[
+        Optional[int],
+        Query(gt=0, description="Only products of this category."),
+    ] = None,
+    min_price: Annotated[
+        Optional[int],
+        Query(ge=0, description="Minimum price, inclusive."),
+    ] = None,
+    max_price: Annotated[
+        Optional[int],
+        Query(ge=0, description="Maximum price, inclusive."),
+    ] = None,
+    name: Annotated[
+        Optional[str],
+        Query(
+            min_length=1,
+            max_length=128,
+            description="Only products whose name starts with this prefix.",
+        ),
+    ] = None,
+    sort: Annotated[
+        ProductSort,
+        Query(description="Sort order, '-' means descending."),
+    ] = ProductSort.ID,
+) -> ProductFilterParams:
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INVALID_PRICE_RANGE",
+                "reason": "'min_price' must not be greater than 'max_price'.",
+            },
+        )
+
+    return ProductFilterParams(
+        category_id=category_id,
+        min_price=min_price,
+        max_price=max_price,
+        name=name,
+        sort=sort,
+    )
@@ -0,0 +1,6 @@
+__all__ = (
+    "UserFilterParams",
+    "user_filter_params",
+)
+
+from .filters import UserFilterParams, user_filter_params
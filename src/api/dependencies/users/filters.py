@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Annotated, Optional
+
+from fastapi import HTTPException, Query, status
+
+
+@dataclass(frozen=True, slots=True)
+class UserFilterParams:
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+    registered_from: Optional[datetime] = None
+    registered_to: Optional[datetime] = None
+    email: Optional[str] = None
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # 'registered_on' is a timestamp without time zone, stored in UTC
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def user_filter_params(
+    is_active: Annotated[
+        Optional[bool],
+        Query(description="Only active or only inactive users."),
+    ] = None,
+    is_verified: Annotated[
+        Optional[bool],
+        Query(description="Only users with or without a verified e-mail."),
+    ] = None,
+    is_superuser: Annotated[
+        Optional[bool],
+        Query(description="Only superusers or only regular users."),
+    ] = None,
+    registered_from: Annotated[
+        Optional[datetime],
+        Query(description="Registered at or after this time."),
+    ] = None,
+    registered_to: Annotated[
+        Optional[datetime],
+        Query(description="Registered before this time."),
+    ] = None,
+    email: Annotated[
+        Optional[str],
+        Query(
+            min_length=1,
+            max_length=320,
+            description="Only users whose e-mail starts with this prefix, case-insensitive.",
+        ),
+    ] = None,
+) -> UserFilterParams:
+    registered_from = _naive_utc(registered_from)
+    registered_to = _naive_utc(registered_to)
+    if (
+        registered_from is not None
+        and registered_to is not None
+        and registered_from >= registered_to
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "INVALID_DATE_RANGE",
+                "reason": "'registered_from' must be earlier than 'registered_to'.",
+            },
+        )
+
+    return UserFilterParams(
+        is_active=is_active,
+        is_verified=is_verified,
+        is_superuser=is_superuser,
+        registered_from=registered_from,
+        registered_to=registered_to,
+        email=email,
+    )
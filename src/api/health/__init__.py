@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from .health import router as health_router
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"],
+    include_in_schema=False,
+)
+
+router.include_router(router=health_router)
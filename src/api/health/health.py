@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException
+from starlette import status
+
+from core.config import settings
+from core.helpers import warm_up
+
+router = APIRouter()
+
+
+@router.get(
+    "/ready",
+    status_code=status.HTTP_200_OK,
+    name="health:ready",
+    description="<h1>Whether this worker is warmed up and can take traffic</h1>",
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Still warming up",
+        },
+    },
+)
+async def ready() -> dict[str, str]:
+    if settings.warm_up.enabled and not warm_up.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "code": "WARMING_UP",
+                "reason": "The worker is not warmed up yet",
+            },
+            headers={"Retry-After": str(int(settings.warm_up.retry_interval))},
+        )
+    return {"status": "ready"}
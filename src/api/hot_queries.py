@@ -0,0 +1,59 @@
+"""Reads of the busiest routes, run once per database on startup"""
+
+from api.api_v1.categories import crud as categories_crud
+from api.api_v1.products import crud as products_crud
+from api.api_v1.users import crud as users_crud
+from api.dependencies.products import ProductFilterParams
+from api.dependencies.users import UserFilterParams
+from core.config import settings
+from core import queries
+from core.helpers import category_cache
+from core.helpers.db_helper import ReadSession
+
+
+async def first_products_page(session: ReadSession) -> None:
+    await products_crud.get_products(
+        session=session,
+        filters=ProductFilterParams(),
+        limit=settings.pagination.default_limit,
+    )
+
+
+async def product_by_id(session: ReadSession) -> None:
+    # No such row, only the statement matters
+    await session.execute(queries.product_row_by_id(0))
+
+
+async def first_categories_page(session: ReadSession) -> None:
+    await categories_crud.get_categories_with_products(
+        session=session,
+        limit=settings.pagination.default_limit,
+        products_limit=settings.pagination.default_embedded_limit,
+    )
+
+
+async def catalog_versions(session: ReadSession) -> None:
+    await session.execute(queries.catalog_versions(("products", "categories")))
+
+
+async def category_tree(session: ReadSession) -> None:
+    # Also fills the category cache when its listener is connected
+    await category_cache.get_tree(session=session)
+
+
+async def first_users_page(session: ReadSession) -> None:
+    await users_crud.get_users(
+        session=session,
+        filters=UserFilterParams(),
+        limit=settings.pagination.default_limit,
+    )
+
+
+HOT_QUERIES = (
+    first_products_page,
+    product_by_id,
+    first_categories_page,
+    catalog_versions,
+    category_tree,
+    first_users_page,
+)
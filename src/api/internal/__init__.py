@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+
+from core.config import settings
+from api.dependencies.internal import internal_network
+from .metrics import router as metrics_router
+
+router = APIRouter(
+    prefix=settings.internal.prefix,
+    tags=["Internal"],
+    dependencies=[Depends(internal_network)],
+    include_in_schema=False,
+)
+
+router.include_router(router=metrics_router)
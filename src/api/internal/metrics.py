@@ -0,0 +1,34 @@
+import os
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette import status
+
+from core.authentication.password_hashing import password_hashing_pool
+from core.helpers import db_helper
+from core.helpers.metrics import Exposition
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    name="internal:metrics",
+    description="<h1>Metrics of this worker, in the Prometheus text format</h1>",
+)
+async def get_metrics() -> PlainTextResponse:
+    # Every worker has its own pools: a scrape sees whichever one answers
+    exposition = Exposition(worker=os.getpid())
+    db_helper.export_metrics(exposition)
+    exposition.histogram(password_hashing_pool.queue_wait)
+    exposition.gauge(
+        "password_hashing_pending",
+        "Password hashes running or waiting for a worker",
+        password_hashing_pool.pending,
+    )
+    return PlainTextResponse(
+        exposition.render(),
+        media_type="text/plain; version=0.0.4",
+    )
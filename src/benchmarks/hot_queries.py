@@ -0,0 +1,143 @@
+"""Per-request cost of the hot reads: select() built on every call against
+the lambda statements of core.queries.
+
+    cd src && python -m benchmarks.hot_queries [database url]
+
+First the statements alone: built and given the cache key SQLAlchemy
+looks the compiled form up by. Then executed, on an in-memory SQLite
+database without a URL, where the query itself costs next to nothing.
+Given the URL of a migrated PostgreSQL database they also run with
+asyncpg's prepared statement cache off, so each read is parsed and
+planned by the server again.
+"""
+
+import asyncio
+import sys
+import time
+import timeit
+from typing import Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core import queries
+from core.models import Category
+
+CALLS = 2000
+REPEAT = 5
+
+
+async def built_by_id(session: AsyncSession, category_id: int) -> None:
+    stmt = select(Category).where(Category.id == category_id)
+    (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def lambda_by_id(session: AsyncSession, category_id: int) -> None:
+    stmt = queries.object_by_id(Category, category_id)
+    (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def built_nodes(session: AsyncSession, category_id: int) -> None:
+    stmt = select(
+        Category.name,
+        Category.description,
+        Category.parent_id,
+        Category.id,
+    ).order_by(Category.id)
+    (await session.execute(stmt)).all()
+
+
+async def lambda_nodes(session: AsyncSession, category_id: int) -> None:
+    (await session.execute(queries.category_nodes())).all()
+
+
+READS = (
+    ("by id, select()", built_by_id),
+    ("by id, lambda", lambda_by_id),
+    ("tree, select()", built_nodes),
+    ("tree, lambda", lambda_nodes),
+)
+
+STATEMENTS = (
+    ("by id, select()", lambda: select(Category).where(Category.id == 5)),
+    ("by id, lambda", lambda: queries.object_by_id(Category, 5)),
+    (
+        "tree, select()",
+        lambda: select(
+            Category.name,
+            Category.description,
+            Category.parent_id,
+            Category.id,
+        ).order_by(Category.id),
+    ),
+    ("tree, lambda", queries.category_nodes),
+)
+
+
+def print_result(name: str, seconds: float) -> None:
+    print(f"  {name:<16} {seconds * 1_000_000:8.1f} us")
+
+
+def measure_statements() -> None:
+    print("statement and cache key:")
+    for name, build in STATEMENTS:
+        seconds = min(
+            timeit.repeat(
+                lambda: build()._generate_cache_key(),
+                number=CALLS,
+                repeat=REPEAT,
+            )
+        )
+        print_result(name, seconds / CALLS)
+
+
+async def measure(
+    session: AsyncSession,
+    read: Callable[[AsyncSession, int], Awaitable[None]],
+) -> float:
+    # The first call compiles and prepares, as the warm-up does
+    await read(session, 1)
+    best = float("inf")
+    for _ in range(REPEAT):
+        started_at = time.perf_counter()
+        for i in range(CALLS):
+            await read(session, i % 100 + 1)
+        best = min(best, time.perf_counter() - started_at)
+    return best / CALLS
+
+
+async def run(url: str, connect_args: dict) -> None:
+    engine = create_async_engine(url, connect_args=connect_args)
+    if url.startswith("sqlite"):
+        async with engine.begin() as connection:
+            await connection.run_sync(Category.__table__.create)
+            await connection.execute(
+                Category.__table__.insert(),
+                [{"id": i, "name": f"Category {i}"} for i in range(1, 101)],
+            )
+
+    async with AsyncSession(engine) as session:
+        for name, read in READS:
+            print_result(name, await measure(session, read))
+    await engine.dispose()
+
+
+def main() -> None:
+    measure_statements()
+
+    url = sys.argv[1] if len(sys.argv) > 1 else "sqlite+aiosqlite://"
+    if url.startswith("postgresql+asyncpg"):
+        runs = [
+            ("executed, prepared once", {"prepared_statement_cache_size": 100}),
+            ("executed, prepared every time", {"prepared_statement_cache_size": 0}),
+        ]
+    else:
+        runs = [("executed, in-memory SQLite", {})]
+
+    for title, connect_args in runs:
+        print(f"{title}:")
+        asyncio.run(run(url, connect_args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 __all__ = (
     "not_found_exception_handler",
     "forbidden_exception_handler",
+    "password_hashing_busy_handler",
 )
 
-from .exception_handler import not_found_exception_handler, forbidden_exception_handler
+from .exception_handler import (
+    not_found_exception_handler,
+    forbidden_exception_handler,
+    password_hashing_busy_handler,
+)
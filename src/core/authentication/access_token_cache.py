@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, TYPE_CHECKING
+
+from fastapi_users.authentication.strategy.db import AP
+from fastapi_users_db_sqlalchemy.access_token import SQLAlchemyAccessTokenDatabase
+from sqlalchemy import delete, func, select
+
+from core.config import settings
+from core.helpers.lru_cache import LRUTTLCache
+from core.helpers.pg_listener import PgListener, pg_listener
+from .token_cache import token_digest, verified_token_cache
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Carries the digest of every access token deleted on logout
+CHANNEL = "access_tokens_revoked"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAccessToken:
+    user_id: int
+    created_at: datetime
+
+
+class AccessTokenCache:
+    """In-process copy of the 'access_tokens' rows in use, keyed by token digest.
+
+    Like the category cache it is trusted only while the LISTEN connection
+    is up, so a logout on any worker reaches all of them. Unknown tokens
+    are remembered too, for a shorter time: a token is generated by the
+    server before anyone can present it, so a miss cannot turn into a hit.
+    """
+
+    def __init__(
+        self,
+        listener: PgListener,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        lifetime_seconds: Optional[int] = None,
+    ) -> None:
+        self.listener = listener
+        self.lifetime_seconds = lifetime_seconds
+        self.tokens: LRUTTLCache[str, CachedAccessToken] = LRUTTLCache(maxsize, ttl)
+        self.unknown: LRUTTLCache[str, bool] = LRUTTLCache(maxsize, negative_ttl)
+
+        # Bumped on revocation, a lookup that raced with one is not cached
+        self._generation = 0
+        self._subscribed = False
+
+    @property
+    def active(self) -> bool:
+        return self._subscribed and self.listener.connected
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def put(self, digest: str, token: CachedAccessToken, generation: int) -> None:
+        if generation != self._generation:
+            return
+        expires_at = None
+        if self.lifetime_seconds:
+            expires_at = (
+                token.created_at + timedelta(seconds=self.lifetime_seconds)
+            ).timestamp()
+        self.tokens.set(digest, token, expires_at=expires_at)
+
+    def put_unknown(self, digest: str, generation: int) -> None:
+        if generation == self._generation:
+            self.unknown.set(digest, True)
+
+    def revoke(self, digest: str) -> None:
+        self._generation += 1
+        self.tokens.discard(digest)
+        verified_token_cache.discard(digest)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.tokens.clear()
+        self.unknown.clear()
+
+    def start(self) -> None:
+        # Logouts made while nobody was listening are unknown
+        if not self._subscribed:
+            self.listener.subscribe(CHANNEL, self.revoke, on_connect=self.clear)
+            self._subscribed = True
+
+    def get_db(
+        self,
+        session: "AsyncSession",
+        access_token_table: type[AP],
+    ) -> "CachedAccessTokenDatabase[AP]":
+        return CachedAccessTokenDatabase(session, access_token_table, cache=self)
+
+
+class CachedAccessTokenDatabase(SQLAlchemyAccessTokenDatabase[AP]):
+    """SQLAlchemyAccessTokenDatabase reading through an AccessTokenCache"""
+
+    def __init__(
+        self,
+        session: "AsyncSession",
+        access_token_table: type[AP],
+        cache: AccessTokenCache,
+    ) -> None:
+        super().__init__(session, access_token_table)
+        self.cache = cache
+
+    async def get_by_token(
+        self,
+        token: str,
+        max_age: Optional[datetime] = None,
+    ) -> Optional[AP]:
+        cache = self.cache
+        if not cache.active:
+            return await super().get_by_token(token, max_age)
+
+        digest = token_digest(token)
+        if cache.unknown.get(digest):
+            return None
+
+        cached = cache.tokens.get(digest)
+        if cached is None:
+            generation = cache.generation
+            # Cached regardless of 'max_age', checked below on every read
+            access_token = await super().get_by_token(token)
+            if access_token is None:
+                cache.put_unknown(digest, generation)
+                return None
+
+            cached = CachedAccessToken(
+                user_id=access_token.user_id,
+                created_at=access_token.created_at,
+            )
+            cache.put(digest, cached, generation)
+            if max_age is None or cached.created_at >= max_age:
+                return access_token
+            return None
+
+        if max_age is not None and cached.created_at < max_age:
+            return None
+        # Transient instance: only read, and deleted by token below
+        return self.access_token_table(
+            token=token,
+            user_id=cached.user_id,
+            created_at=cached.created_at,
+        )
+
+    async def delete(self, access_token: AP) -> None:
+        digest = token_digest(access_token.token)
+        await self.session.execute(
+            delete(self.access_token_table).where(
+                self.access_token_table.token == access_token.token
+            )
+        )
+        # Delivered to every worker, this one included, once committed
+        await self.session.execute(select(func.pg_notify(CHANNEL, digest)))
+        await self.session.commit()
+        self.cache.revoke(digest)
+
+
+access_token_cache = AccessTokenCache(
+    listener=pg_listener,
+    maxsize=settings.access_token.cache_size,
+    ttl=settings.access_token.cache_ttl,
+    negative_ttl=settings.access_token.negative_cache_ttl,
+    lifetime_seconds=settings.access_token.lifetime_seconds,
+)
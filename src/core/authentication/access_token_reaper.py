@@ -0,0 +1,220 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import column, delete, select, table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from core.helpers import db_helper
+from core.logger import logger as log
+from core.models import AccessToken
+
+# Daily partitions are named 'access_tokens_pYYYYMMDD', bounds in UTC
+PARTITION_PREFIX = "access_tokens_p"
+DEFAULT_PARTITION = "access_tokens_default"
+# Key of the advisory lock serializing partition maintenance between workers
+PARTITION_LOCK_KEY = 0x61636374
+
+
+def partition_name(day: datetime) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+class AccessTokenReaper:
+    """Removes expired rows from 'access_tokens' in the background.
+
+    A plain table is cleaned with small DELETE batches, one transaction
+    each, so the reaper never holds many locks or a long transaction. A
+    table partitioned by 'created_at' (see the access_tokens_partitioning
+    revision) is cleaned by dropping the daily partitions that have fully
+    expired, and partitions for the next days are created ahead.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        lifetime_seconds: int,
+        interval: float,
+        batch_size: int,
+        partitions_ahead: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.lifetime_seconds = lifetime_seconds
+        self.interval = interval
+        self.batch_size = batch_size
+        self.partitions_ahead = partitions_ahead
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _is_partitioned(session: AsyncSession) -> bool:
+        relkind = await session.scalar(
+            text("SELECT relkind FROM pg_class WHERE oid = 'access_tokens'::regclass")
+        )
+        return relkind == "p"
+
+    async def delete_expired(self, cutoff: datetime, table_name: str) -> int:
+        tokens = table(table_name, column("token"), column("created_at"))
+        expired = (
+            select(tokens.c.token)
+            .where(tokens.c.created_at < cutoff)
+            .limit(self.batch_size)
+            # Workers reaping at the same time take different rows
+            .with_for_update(skip_locked=True)
+        )
+
+        deleted = 0
+        while True:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    delete(tokens).where(tokens.c.token.in_(expired))
+                )
+                await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < self.batch_size:
+                return deleted
+            # Let requests use the pool between batches
+            await asyncio.sleep(0)
+
+    @staticmethod
+    async def _add_partition(session: AsyncSession, day: datetime) -> None:
+        """Creates the partition of 'day' as a table of its own, moves in the
+        rows the default partition got for that day, then attaches it.
+
+        Rows of a day without a partition, e.g. after the reaper was off
+        for longer than 'partitions_ahead' days, land in the default one;
+        while they are there, 'CREATE TABLE ... PARTITION OF' would fail.
+        """
+        name = partition_name(day)
+        start, end = day, day + timedelta(days=1)
+
+        # Taken by the attach anyway: no new rows for that day meanwhile
+        await session.execute(
+            text(f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE")
+        )
+        await session.execute(
+            text(f"CREATE TABLE {name} (LIKE access_tokens INCLUDING DEFAULTS)")
+        )
+        await session.execute(
+            text(
+                f"WITH moved AS ("
+                f"DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE created_at >= :start AND created_at < :end "
+                f"RETURNING user_id, token, created_at) "
+                f"INSERT INTO {name} (user_id, token, created_at) "
+                f"SELECT user_id, token, created_at FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+        await session.execute(
+            text(
+                f"ALTER TABLE access_tokens ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+
+    async def rotate_partitions(self, cutoff: datetime) -> int:
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        dropped = 0
+        async with self.session_factory() as session:
+            locked = await session.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": PARTITION_LOCK_KEY},
+            )
+            if not locked:
+                # Another worker is on it
+                return 0
+
+            for days in range(self.partitions_ahead + 1):
+                day = today + timedelta(days=days)
+                exists = await session.scalar(
+                    text("SELECT to_regclass(:name) IS NOT NULL"),
+                    {"name": partition_name(day)},
+                )
+                if exists:
+                    continue
+                # A day that fails is retried next time, the drops still run
+                try:
+                    async with session.begin_nested():
+                        await self._add_partition(session, day)
+                except DBAPIError as ex:
+                    log.warning(
+                        "Access token partition %s not created: %r",
+                        partition_name(day),
+                        ex,
+                    )
+
+            partitions = await session.scalars(
+                text(
+                    "SELECT c.relname FROM pg_inherits AS i "
+                    "JOIN pg_class AS c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = 'access_tokens'::regclass"
+                )
+            )
+            for name in partitions.all():
+                if not name.startswith(PARTITION_PREFIX):
+                    continue
+                day = datetime.strptime(
+                    name.removeprefix(PARTITION_PREFIX), "%Y%m%d"
+                ).replace(tzinfo=timezone.utc)
+                if day + timedelta(days=1) <= cutoff:
+                    await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    dropped += 1
+
+            await session.commit()
+        return dropped
+
+    async def reap(self) -> None:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.lifetime_seconds)
+
+        async with self.session_factory() as session:
+            partitioned = await self._is_partitioned(session)
+
+        if partitioned:
+            # Only rows outside every daily range end up in the default one;
+            # the unexpired ones of a day are moved when its partition is added
+            deleted = await self.delete_expired(cutoff, DEFAULT_PARTITION)
+            dropped = await self.rotate_partitions(cutoff)
+            if dropped or deleted:
+                log.info(
+                    "Dropped %s expired access token partitions, %s rows",
+                    dropped,
+                    deleted,
+                )
+        else:
+            deleted = await self.delete_expired(cutoff, AccessToken.__tablename__)
+            if deleted:
+                log.info("Deleted %s expired access tokens", deleted)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reap()
+            except (OSError, DBAPIError) as ex:
+                log.warning("Access token reaper failed: %r", ex)
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+access_token_reaper = AccessTokenReaper(
+    session_factory=db_helper.session_factory,
+    lifetime_seconds=settings.access_token.lifetime_seconds,
+    interval=settings.access_token_reaper.interval,
+    batch_size=settings.access_token_reaper.batch_size,
+    partitions_ahead=settings.access_token_reaper.partitions_ahead,
+)
@@ -0,0 +1,167 @@
+import asyncio
+import base64
+import hashlib
+import signal
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from cryptography.hazmat.primitives import serialization
+
+from core.config import settings
+from core.logger import logger as log
+
+
+@dataclass(frozen=True, slots=True)
+class JWTKey:
+    kid: str
+    public_key: Any
+    private_key: Any = None
+
+
+def _load_public_key(pem: bytes) -> JWTKey:
+    public_key = serialization.load_pem_public_key(pem)
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    # Key ID is the fingerprint of the public key, the same in every worker
+    kid = base64.urlsafe_b64encode(hashlib.sha256(der).digest()[:12]).decode()
+    return JWTKey(kid=kid, public_key=public_key)
+
+
+class JWTKeyManager:
+    """Parsed RSA key material for signing and verifying JWTs.
+
+    Keys are read and parsed once, then again only on rotation: on SIGHUP
+    or when the files change. A replaced key stays valid for verification
+    during 'retire_after' seconds, so tokens it signed do not break.
+    """
+
+    def __init__(
+        self,
+        private_key_path: Path,
+        public_key_path: Path,
+        previous_public_key_paths: list[Path],
+        retire_after: int,
+        reload_interval: float = 0,
+    ) -> None:
+        self.private_key_path = private_key_path
+        self.public_key_path = public_key_path
+        self.previous_public_key_paths = previous_public_key_paths
+        self.retire_after = retire_after
+        self.reload_interval = reload_interval
+
+        self._current: Optional[JWTKey] = None
+        self._previous: dict[str, JWTKey] = {}
+        # kid -> (key, monotonic time it stops being accepted)
+        self._retired: dict[str, tuple[JWTKey, float]] = {}
+        self._stamp: Optional[tuple] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _files_stamp(self) -> tuple:
+        paths = [
+            self.private_key_path,
+            self.public_key_path,
+            *self.previous_public_key_paths,
+        ]
+        return tuple((stat.st_mtime_ns, stat.st_size) for stat in map(Path.stat, paths))
+
+    def reload(self) -> bool:
+        stamp = self._files_stamp()
+        if stamp == self._stamp:
+            return False
+
+        current = _load_public_key(self.public_key_path.read_bytes())
+        current = JWTKey(
+            kid=current.kid,
+            public_key=current.public_key,
+            private_key=serialization.load_pem_private_key(
+                self.private_key_path.read_bytes(),
+                password=None,
+            ),
+        )
+        previous = {
+            key.kid: key
+            for key in (
+                _load_public_key(path.read_bytes())
+                for path in self.previous_public_key_paths
+            )
+        }
+
+        old = self._current
+        if old is not None and old.kid != current.kid:
+            self._retired[old.kid] = (old, time.monotonic() + self.retire_after)
+            log.info("JWT signing key rotated: %r -> %r", old.kid, current.kid)
+
+        self._current, self._previous, self._stamp = current, previous, stamp
+        return True
+
+    @property
+    def current(self) -> JWTKey:
+        if self._current is None:
+            self.reload()
+        return self._current
+
+    def public_key(self, kid: Optional[str]) -> Any:
+        current = self.current
+        # Tokens issued before key IDs were introduced carry no 'kid'
+        if kid is None or kid == current.kid:
+            return current.public_key
+        if kid in self._previous:
+            return self._previous[kid].public_key
+
+        retired = self._retired.get(kid)
+        if retired is None:
+            return None
+        key, expires_at = retired
+        if time.monotonic() > expires_at:
+            del self._retired[kid]
+            return None
+        return key.public_key
+
+    async def areload(self) -> None:
+        try:
+            await asyncio.to_thread(self.reload)
+        except (OSError, ValueError) as ex:
+            # Keep serving with the keys already loaded
+            log.error("Failed to reload JWT keys: %r", ex)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await self.areload()
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self.reload)
+
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGHUP,
+                lambda: asyncio.ensure_future(self.areload()),
+            )
+        except (AttributeError, NotImplementedError, RuntimeError):
+            # No SIGHUP on Windows, or not in the main thread
+            pass
+
+        if self.reload_interval and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+jwt_keys = JWTKeyManager(
+    private_key_path=settings.auth_jwt.private_key_path,
+    public_key_path=settings.auth_jwt.public_key_path,
+    previous_public_key_paths=settings.auth_jwt.previous_public_key_paths,
+    retire_after=settings.auth_jwt.access_token_expire_minutes,
+    reload_interval=settings.auth_jwt.reload_interval,
+)
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Literal, Optional, TypeVar
+
+from fastapi_users.password import PasswordHelper
+
+from core.config import settings
+from core.helpers.metrics import Histogram
+
+T = TypeVar("T")
+
+# Module level, so a process pool can pickle the calls below
+password_helper = PasswordHelper()
+
+
+def _timed(func: Callable[..., T], *args) -> tuple[float, T]:
+    # Monotonic clocks are shared by the processes of one host
+    return time.monotonic(), func(*args)
+
+
+def _hash(password: str) -> str:
+    return password_helper.hash(password)
+
+
+def _verify_and_update(
+    plain_password: str,
+    hashed_password: str,
+) -> tuple[bool, Optional[str]]:
+    return password_helper.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHashingBusy(Exception):
+    """Every worker is busy and the queue is full"""
+
+
+class PasswordHashingPool:
+    """Runs the slow password hashes off the event loop.
+
+    At most 'workers' hashes run at once and 'max_queue' more wait for a
+    worker; past that PasswordHashingBusy is raised instead of queueing,
+    so a login storm is answered with 503 rather than stalling the worker.
+    """
+
+    def __init__(
+        self,
+        executor: Literal["thread", "process"],
+        workers: int,
+        max_queue: int,
+    ) -> None:
+        self.executor_type = executor
+        self.workers = workers
+        self.max_queue = max_queue
+
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.queue_wait = Histogram(
+            name="password_hashing_queue_wait_seconds",
+            description="Time a password hash waited for a free worker",
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def executor(self) -> Executor:
+        # Created on first use too, for code running outside the app lifespan
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hashing",
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self.workers + self.max_queue:
+            raise PasswordHashingBusy()
+
+        self._pending += 1
+        try:
+            submitted_at = time.monotonic()
+            started_at, result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _timed, func, *args
+            )
+            self.queue_wait.observe(max(started_at - submitted_at, 0.0))
+            return result
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify_and_update(
+        self,
+        plain_password: str,
+        hashed_password: str,
+    ) -> tuple[bool, Optional[str]]:
+        return await self._run(_verify_and_update, plain_password, hashed_password)
+
+    def start(self) -> None:
+        self.executor
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hashing_pool = PasswordHashingPool(
+    executor=settings.password_hashing.executor,
+    workers=settings.password_hashing.workers,
+    max_queue=settings.password_hashing.max_queue,
+)
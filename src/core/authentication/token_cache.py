@@ -0,0 +1,90 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Optional, TYPE_CHECKING
+
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.config import settings
+from core.helpers.lru_cache import LRUTTLCache
+from core.helpers.pg_listener import PgListener, pg_listener
+from core.models import User
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Carries the id of every user whose cached tokens must be dropped
+CHANNEL = "user_tokens_invalidated"
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    user_id: int
+    # Column values of the 'users' row at the time the token was verified
+    values: dict[str, Any]
+
+    @classmethod
+    def of(cls, user: User) -> "UserSnapshot":
+        return cls(
+            user_id=user.id,
+            values={
+                attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+            },
+        )
+
+    async def to_user(self, session: "AsyncSession") -> User:
+        # A fresh instance per request, attached to the request's session
+        # without a SELECT, so it can still be updated like a loaded one.
+        user = User(**self.values)
+        make_transient_to_detached(user)
+        return await session.merge(user, load=False)
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache(LRUTTLCache[str, UserSnapshot]):
+    """Token digest -> snapshot of its user, kept until the token expires at most.
+
+    Read only while the LISTEN connection is up: a user changed on any
+    worker, e.g. deactivated or demoted, is dropped from all of them.
+    """
+
+    def __init__(self, listener: PgListener, maxsize: int, ttl: float) -> None:
+        super().__init__(maxsize, ttl)
+        self.listener = listener
+        self._subscribed = False
+
+    @property
+    def active(self) -> bool:
+        return self._subscribed and self.listener.connected
+
+    def get(self, key: str) -> Optional[UserSnapshot]:
+        if not self.active:
+            return None
+        return super().get(key)
+
+    def discard_user(self, payload: str) -> None:
+        user_id = int(payload)
+        self.discard_where(lambda snapshot: snapshot.user_id == user_id)
+
+    def start(self) -> None:
+        # Users changed while nobody was listening are unknown
+        if not self._subscribed:
+            self.listener.subscribe(CHANNEL, self.discard_user, on_connect=self.clear)
+            self._subscribed = True
+
+
+verified_token_cache = VerifiedTokenCache(
+    listener=pg_listener,
+    maxsize=settings.auth_jwt.token_cache_size,
+    ttl=settings.auth_jwt.token_cache_ttl,
+)
+
+
+async def invalidate_user_tokens(session: "AsyncSession", user_id: int) -> None:
+    # Delivered to every worker, this one included, once committed
+    await session.execute(select(func.pg_notify(CHANNEL, str(user_id))))
+    await session.commit()
+    verified_token_cache.discard_user(str(user_id))
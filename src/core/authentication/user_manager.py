@@ -1,10 +1,13 @@
-from typing import Optional, TYPE_CHECKING, Union
+from typing import Any, Dict, Optional, TYPE_CHECKING, Union
 
+import jwt
 from fastapi_users import (
     BaseUserManager,
     IntegerIDMixin,
     InvalidPasswordException,
+    exceptions,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 
 from core.schemas.user import UserCreate as UserCreateSchema
 from core.types.user_id import UserIdType
@@ -12,9 +15,12 @@ from core.models import User as UserModel
 
 from core.config import settings
 from core.logger import logger as log
+from .password_hashing import password_hashing_pool
+from .token_cache import invalidate_user_tokens
 
 if TYPE_CHECKING:
     from fastapi import Request
+    from fastapi.security import OAuth2PasswordRequestForm
 
 
 class UserManager(IntegerIDMixin, BaseUserManager[UserModel, UserIdType]):
@@ -42,6 +48,145 @@ class UserManager(IntegerIDMixin, BaseUserManager[UserModel, UserIdType]):
         if password.isnumeric():
             raise InvalidPasswordException("Password cannot consist of digits only")
 
+    # BaseUserManager hashes on the event loop, the methods below are its
+    # own with every hash awaited on the password hashing pool instead.
+    # fastapi-users is pinned in pyproject.toml, re-copy them when upgrading it.
+
+    # Mirrors BaseUserManager.create of fastapi-users 15.0.5
+    async def create(
+        self,
+        user_create: UserCreateSchema,
+        safe: bool = False,
+        request: Optional["Request"] = None,
+    ) -> UserModel:
+        await self.validate_password(user_create.password, user_create)
+
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await password_hashing_pool.hash(password)
+
+        created_user = await self.user_db.create(user_dict)
+
+        await self.on_after_register(created_user, request)
+
+        return created_user
+
+    # Mirrors BaseUserManager.authenticate of fastapi-users 15.0.5
+    async def authenticate(
+        self,
+        credentials: "OAuth2PasswordRequestForm",
+    ) -> Optional[UserModel]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Run the hasher to mitigate timing attack
+            await password_hashing_pool.hash(credentials.password)
+            return None
+
+        verified, updated_password_hash = await password_hashing_pool.verify_and_update(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        # Update password hash to a more robust one if needed
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+
+        return user
+
+    # Mirrors BaseUserManager.forgot_password of fastapi-users 15.0.5
+    async def forgot_password(
+        self,
+        user: UserModel,
+        request: Optional["Request"] = None,
+    ) -> None:
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        token_data = {
+            "sub": str(user.id),
+            "password_fgpt": await password_hashing_pool.hash(user.hashed_password),
+            "aud": self.reset_password_token_audience,
+        }
+        token = generate_jwt(
+            token_data,
+            self.reset_password_token_secret,
+            self.reset_password_token_lifetime_seconds,
+        )
+        await self.on_after_forgot_password(user, token, request)
+
+    # Mirrors BaseUserManager.reset_password of fastapi-users 15.0.5
+    async def reset_password(
+        self,
+        token: str,
+        password: str,
+        request: Optional["Request"] = None,
+    ) -> UserModel:
+        try:
+            data = decode_jwt(
+                token,
+                self.reset_password_token_secret,
+                [self.reset_password_token_audience],
+            )
+        except jwt.PyJWTError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            user_id = data["sub"]
+            password_fingerprint = data["password_fgpt"]
+        except KeyError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            parsed_id = self.parse_id(user_id)
+        except exceptions.InvalidID:
+            raise exceptions.InvalidResetPasswordToken()
+
+        user = await self.get(parsed_id)
+
+        valid_password_fingerprint, _ = await password_hashing_pool.verify_and_update(
+            user.hashed_password, password_fingerprint
+        )
+        if not valid_password_fingerprint:
+            raise exceptions.InvalidResetPasswordToken()
+
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        updated_user = await self._update(user, {"password": password})
+
+        await self.on_after_reset_password(user, request)
+
+        return updated_user
+
+    # Mirrors BaseUserManager._update of fastapi-users 15.0.5
+    async def _update(self, user: UserModel, update_dict: Dict[str, Any]) -> UserModel:
+        validated_update_dict = {}
+        for field, value in update_dict.items():
+            if field == "email" and value != user.email:
+                try:
+                    await self.get_by_email(value)
+                    raise exceptions.UserAlreadyExists()
+                except exceptions.UserNotExists:
+                    validated_update_dict["email"] = value
+                    validated_update_dict["is_verified"] = False
+            elif field == "password" and value is not None:
+                await self.validate_password(value, user)
+                validated_update_dict["hashed_password"] = (
+                    await password_hashing_pool.hash(value)
+                )
+            else:
+                validated_update_dict[field] = value
+        return await self.user_db.update(user, validated_update_dict)
+
     async def on_after_register(
         self,
         user: UserModel,
@@ -75,3 +220,33 @@ class UserManager(IntegerIDMixin, BaseUserManager[UserModel, UserIdType]):
             user.id,
             token,
         )
+
+    # Cached tokens carry a snapshot of the user, drop it on every change
+    async def on_after_update(
+        self,
+        user: UserModel,
+        update_dict: Dict[str, Any],
+        request: Optional["Request"] = None,
+    ):
+        await invalidate_user_tokens(self.user_db.session, user.id)
+
+    async def on_after_verify(
+        self,
+        user: UserModel,
+        request: Optional["Request"] = None,
+    ):
+        await invalidate_user_tokens(self.user_db.session, user.id)
+
+    async def on_after_reset_password(
+        self,
+        user: UserModel,
+        request: Optional["Request"] = None,
+    ):
+        await invalidate_user_tokens(self.user_db.session, user.id)
+
+    async def on_after_delete(
+        self,
+        user: UserModel,
+        request: Optional["Request"] = None,
+    ):
+        await invalidate_user_tokens(self.user_db.session, user.id)
@@ -1,7 +1,8 @@
+from ipaddress import ip_network
 from pathlib import Path
 from typing import Literal
 
-from pydantic import BaseModel, PostgresDsn, SecretStr
+from pydantic import BaseModel, IPvAnyNetwork, PostgresDsn, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).parent.parent
@@ -28,6 +29,39 @@ class DatabaseConfig(BaseModel):
     echo_pool: bool = False
     pool_size: int = 50
     max_overflow: int = 15
+    # Seconds between attempts to restore the LISTEN connection used by the caches
+    listen_reconnect_delay: float = 5.0
+    # Read replicas behind the read-only sessions, the primary serves
+    # those reads when no replica is healthy
+    replica_urls: list[PostgresDsn] = []
+    replica_pool_size: int = 20
+    replica_max_overflow: int = 10
+    # Seconds between health checks, and the replay lag putting a replica
+    # out of use until it has caught up
+    replica_check_interval: float = 5.0
+    replica_max_lag: float = 10.0
+    # Seconds a client reads from the primary after its own change,
+    # remembered in a cookie
+    read_your_writes_window: float = 5.0
+    read_your_writes_cookie: str = "primary_reads_until"
+    # Adaptive pool of the primary: each of 'workers' processes may open
+    # up to pool_budget // workers connections, and keeps open as many
+    # as it recently needed at once (pool_size and max_overflow are unused)
+    pool_adaptive: bool = False
+    pool_budget: int = 100
+    workers: int = 1
+    pool_min_idle: int = 2
+    # Seconds of observed concurrency behind each resize
+    pool_adapt_interval: float = 30.0
+    # Statements compiled by SQLAlchemy, kept per engine
+    compiled_cache_size: int = 500
+    # Statements asyncpg keeps prepared per connection, 0 prepares each time
+    prepared_statement_cache_size: int = 100
+    # pgbouncer in transaction mode hands a client connection different
+    # server connections: prepared statements get names unique across them
+    # (pgbouncer >= 1.21 with max_prepared_statements; on older versions
+    # set prepared_statement_cache_size to 0 as well)
+    pgbouncer: bool = False
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -38,11 +72,125 @@ class DatabaseConfig(BaseModel):
     }
 
 
+class PaginationConfig(BaseModel):
+    default_limit: int = 50
+    max_limit: int = 500
+    # Products embedded into each category of a category page
+    default_embedded_limit: int = 10
+    max_embedded_limit: int = 100
+
+
+class ExportConfig(BaseModel):
+    # Rows fetched from the server-side cursor per round trip
+    chunk_size: int = 1000
+
+
+class BulkConfig(BaseModel):
+    # Maximum number of operations in one bulk request
+    max_items: int = 1000
+
+
+class CategoryCacheConfig(BaseModel):
+    enabled: bool = True
+
+
+class CategoryTreeConfig(BaseModel):
+    # Deepest level below a category returned by the subtree endpoints
+    max_depth: int = 16
+    # Products deleted per transaction by a background subtree delete
+    delete_batch_size: int = 5000
+
+
 class AuthJWT(BaseModel):
     private_key_path: Path = BASE_DIR / "certs" / "jwt-private.pem"
     public_key_path: Path = BASE_DIR / "certs" / "jwt-public.pem"
     algorithm: str = "RS256"
     access_token_expire_minutes: int = 3600
+    # Public keys of rotated-out key pairs, still accepted for verification
+    previous_public_key_paths: list[Path] = []
+    # Seconds between checks of the key files for rotation, 0 disables it
+    reload_interval: float = 30.0
+    # Verified tokens cached per worker, each for 'token_cache_ttl' seconds at most.
+    # Changes made through UserManager drop the user's tokens on every worker,
+    # through pg_notify; without a LISTEN connection the cache is bypassed.
+    token_cache_size: int = 10000
+    token_cache_ttl: int = 60
+
+
+class PasswordHashingConfig(BaseModel):
+    # bcrypt and argon2 release the GIL, threads are usually enough
+    executor: Literal["thread", "process"] = "thread"
+    workers: int = 4
+    # Hashes waiting for a free worker, past that requests get 503
+    max_queue: int = 64
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    # "memory" limits each worker on its own, "postgres" shares the
+    # counters of all workers through the 'rate_limit_buckets' table
+    backend: Literal["memory", "postgres"] = "memory"
+    # Burst size and sustained rate of /login, /register, /forgot-password
+    # per client IP, then per e-mail address
+    ip_burst: int = 20
+    ip_per_minute: float = 30
+    email_burst: int = 5
+    email_per_minute: float = 5
+    # In-memory buckets: shards of an LRU holding at most 'max_keys'
+    shards: int = 16
+    max_keys: int = 100000
+    # Seconds between removals of idle Postgres buckets, idle meaning unused
+    # for as long; keep it above burst / rate so removed buckets are full
+    cleanup_interval: float = 600.0
+    # Take the client IP from X-Forwarded-For, only behind a trusted proxy
+    trust_forwarded_for: bool = False
+
+
+class CompressionConfig(BaseModel):
+    enabled: bool = True
+    # Server preference, the first one accepted wins between equal q-values;
+    # 'br' needs the 'brotli' package and 'zstd' the 'zstandard' package
+    encodings: list[Literal["zstd", "br", "gzip"]] = ["zstd", "br", "gzip"]
+    # Complete bodies below it are sent as they are, streams are always compressed
+    minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    zstd_level: int = 3
+    # Compressed bodies kept by encoding and body digest, so a hot response
+    # is compressed once; larger bodies are compressed every time
+    cache_enabled: bool = True
+    cache_size: int = 256
+    cache_ttl: float = 300.0
+    cache_max_body: int = 256 * 1024
+
+
+class AccessTokenReaperConfig(BaseModel):
+    enabled: bool = True
+    # Seconds between two removals of expired access tokens
+    interval: float = 300.0
+    # Expired tokens deleted per transaction
+    batch_size: int = 1000
+    # Daily partitions created in advance when 'access_tokens' is partitioned
+    partitions_ahead: int = 3
+
+
+class WarmUpConfig(BaseModel):
+    enabled: bool = True
+    # Connections opened in every pool before the worker reports ready
+    connections: int = 10
+    # Seconds before another attempt when the database is not reachable
+    retry_interval: float = 5.0
+
+
+class InternalConfig(BaseModel):
+    prefix: str = "/internal"
+    # Clients allowed to reach the internal routes, anyone else gets 404.
+    # Loopback only by default: add the metrics scraper's network, e.g.
+    # MARKET__INTERNAL__ALLOWED_NETWORKS='["127.0.0.0/8","10.0.0.0/8"]'
+    allowed_networks: list[IPvAnyNetwork] = [
+        ip_network("127.0.0.0/8"),
+        ip_network("::1/128"),
+    ]
 
 
 class ApiV1Prefix(BaseModel):
@@ -76,6 +224,12 @@ class AccessToken(BaseModel):
     verification_token_secret: SecretStr
     reset_password_token_audience: str = "Market.io: ResetPasswordToken"
     verification_token_audience: str = "Market.io: VerificationToken"
+    # Access tokens of the DB strategy cached per worker for 'cache_ttl' seconds,
+    # unknown tokens for 'negative_cache_ttl'. Logouts are broadcast with NOTIFY.
+    cache_enabled: bool = True
+    cache_size: int = 10000
+    cache_ttl: int = 60
+    negative_cache_ttl: int = 10
 
 
 class Settings(BaseSettings):
@@ -90,8 +244,19 @@ class Settings(BaseSettings):
     middleware: MiddlewareConfig = MiddlewareConfig()
     api: ApiPrefix = ApiPrefix()
     auth_jwt: AuthJWT = AuthJWT()
+    pagination: PaginationConfig = PaginationConfig()
+    export: ExportConfig = ExportConfig()
+    bulk: BulkConfig = BulkConfig()
+    category_cache: CategoryCacheConfig = CategoryCacheConfig()
+    category_tree: CategoryTreeConfig = CategoryTreeConfig()
     db: DatabaseConfig
     access_token: AccessToken
+    access_token_reaper: AccessTokenReaperConfig = AccessTokenReaperConfig()
+    password_hashing: PasswordHashingConfig = PasswordHashingConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    compression: CompressionConfig = CompressionConfig()
+    warm_up: WarmUpConfig = WarmUpConfig()
+    internal: InternalConfig = InternalConfig()
 
 
 settings = Settings()
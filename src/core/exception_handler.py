@@ -1,6 +1,7 @@
 from fastapi import Request, status, HTTPException
 from fastapi.responses import JSONResponse
 
+from core.authentication.password_hashing import PasswordHashingBusy
 from main import main_app
 
 
@@ -36,3 +37,20 @@ async def not_found_exception_handler(request: Request, exc: HTTPException):
             },
         },
     )
+
+
+@main_app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(
+    request: Request,
+    exc: PasswordHashingBusy,
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "detail": {
+                "code": "PASSWORD_HASHING_BUSY",
+                "reason": "Too many password operations in progress, retry later",
+            }
+        },
+        headers={"Retry-After": "1"},
+    )
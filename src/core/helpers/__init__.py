@@ -1,7 +1,17 @@
 __all__ = (
     "db_helper",
     "reset_database_helper",
+    "import_products_helper",
+    "pg_listener",
+    "category_cache",
+    "rate_limiter",
+    "warm_up",
 )
 
 from .db_helper import db_helper
 from .reset_database_helper import reset_database_helper
+from .import_products_helper import import_products_helper
+from .pg_listener import pg_listener
+from .category_cache import category_cache
+from .rate_limiter import rate_limiter
+from .warm_up import warm_up
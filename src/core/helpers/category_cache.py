@@ -0,0 +1,115 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import queries
+from .db_helper import DatabaseHelper, ReadSession, db_helper
+from .pg_listener import PgListener, pg_listener
+
+# Fired by the 'categories_changed' trigger on every statement touching 'categories'
+CHANNEL = "categories_changed"
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryNode:
+    # In the field order of CategoryRead, it is serialized as is
+    name: str
+    description: Optional[str]
+    parent_id: Optional[int]
+    id: int
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryTree:
+    nodes: dict[int, CategoryNode] = field(default_factory=dict)
+    # parent id (None for root categories) -> children ordered by id
+    children: dict[Optional[int], list[CategoryNode]] = field(default_factory=dict)
+
+    @classmethod
+    async def load(cls, session: Union[AsyncSession, ReadSession]) -> "CategoryTree":
+        result = await session.execute(queries.category_nodes())
+        tree = cls()
+        for row in result:
+            node = CategoryNode(*row)
+            tree.nodes[node.id] = node
+            tree.children.setdefault(node.parent_id, []).append(node)
+        return tree
+
+    def all(self) -> list[CategoryNode]:
+        return list(self.nodes.values())
+
+    def get(self, category_id: int) -> Optional[CategoryNode]:
+        return self.nodes.get(category_id)
+
+    def children_of(self, category_id: Optional[int]) -> list[CategoryNode]:
+        return self.children.get(category_id, [])
+
+
+class CategoryCache:
+    """In-process copy of the category tree.
+
+    The tree is trusted only while the LISTEN connection is up: every
+    notification bumps the generation and the next read reloads it.
+    Without the listener each read loads a fresh tree, as before.
+    """
+
+    def __init__(self, listener: PgListener, db: DatabaseHelper) -> None:
+        self.listener = listener
+        self.db = db
+
+        self._tree: Optional[CategoryTree] = None
+        self._generation = 0
+        self._loaded_generation = -1
+        self._lock = asyncio.Lock()
+        self._subscribed = False
+
+    def invalidate(self, *args) -> None:
+        self._generation += 1
+
+    @property
+    def _listening(self) -> bool:
+        return self._subscribed and self.listener.connected
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._listening
+            and self._tree is not None
+            and self._loaded_generation == self._generation
+        )
+
+    async def get_tree(
+        self,
+        session: Union[AsyncSession, ReadSession],
+    ) -> CategoryTree:
+        if self._is_fresh():
+            return self._tree
+
+        if not self._listening:
+            return await CategoryTree.load(session)
+
+        async with self._lock:
+            if self._is_fresh():
+                return self._tree
+
+            # Invalidations that arrive during the load keep the tree stale.
+            # Loaded from the primary: a tree from a lagging replica would be
+            # kept until the next change.
+            generation = self._generation
+            async with self.db.session_factory() as primary_session:
+                tree = await CategoryTree.load(primary_session)
+            self._tree = tree
+            self._loaded_generation = generation
+            return tree
+
+    def start(self) -> None:
+        # Changes made while nobody was listening are unknown
+        if not self._subscribed:
+            self.listener.subscribe(
+                CHANNEL, self.invalidate, on_connect=self.invalidate
+            )
+            self._subscribed = True
+
+
+category_cache = CategoryCache(listener=pg_listener, db=db_helper)
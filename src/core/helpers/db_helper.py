@@ -1,13 +1,130 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Optional,
+    Sequence,
+)
 
+from fastapi import Request
+from sqlalchemy import Executable, Result, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
+    AsyncConnection,
     AsyncSession,
     AsyncEngine,
 )
 
 from core.config import settings
+from core.logger import logger as log
+from .db_pool import InstrumentedPool, adapted_idle_target
+from .metrics import Exposition
+
+# Seconds of replay lag, 0 when everything received is replayed
+# (an idle primary sends nothing) or when the server is not a standby
+REPLICA_LAG = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def _connect_args(
+    prepared_statement_cache_size: int,
+    pgbouncer: bool,
+) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {
+        "prepared_statement_cache_size": prepared_statement_cache_size,
+    }
+    if pgbouncer:
+        connect_args["prepared_statement_name_func"] = _prepared_statement_name
+        # asyncpg's own cache numbers its statements per connection
+        connect_args["statement_cache_size"] = 0
+    return connect_args
+
+
+def _make_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
+    )
+
+
+def _read_only(engine: AsyncEngine) -> AsyncEngine:
+    # Same pool, transactions opened with 'BEGIN READ ONLY'
+    return engine.execution_options(postgresql_readonly=True)
+
+
+class ReadSession:
+    """Reads of a request in the light mode: Core rows, no ORM session.
+
+    Every statement gets a connection of its own, in a read-only
+    transaction, and gives it back to the pool with all its rows
+    fetched: no connection is held while the response is built and sent,
+    and no identity map keeps track of what was read.
+
+    'connect' chooses the server for the first statement; the others are
+    sent to the same one, so all of them see the same replay position.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], AsyncContextManager[AsyncConnection]],
+    ) -> None:
+        self.connect = connect
+        self.engine: Optional[AsyncEngine] = None
+
+    async def execute(
+        self,
+        statement: Executable,
+        parameters: Optional[dict[str, Any]] = None,
+    ) -> Result:
+        connect = self.connect if self.engine is None else self.engine.connect
+        async with connect() as connection:
+            self.engine = connection.engine
+            result = await connection.execute(statement, parameters)
+            frozen = result.freeze()
+        return frozen()
+
+    async def scalar(
+        self,
+        statement: Executable,
+        parameters: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        result = await self.execute(statement, parameters)
+        return result.scalar()
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.read_engine = _read_only(engine)
+        self.session_factory = _make_session_factory(engine)
+        # Unused until a health check passes
+        self.healthy = False
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
 
 
 class DatabaseHelper:
@@ -18,29 +135,246 @@ class DatabaseHelper:
         echo_pool: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        replica_urls: Sequence[str] = (),
+        replica_pool_size: int = 5,
+        replica_max_overflow: int = 10,
+        replica_check_interval: float = 5.0,
+        replica_max_lag: float = 10.0,
+        read_your_writes_cookie: str = "primary_reads_until",
+        pool_adaptive: bool = False,
+        pool_budget: int = 100,
+        workers: int = 1,
+        pool_min_idle: int = 2,
+        pool_adapt_interval: float = 30.0,
+        compiled_cache_size: int = 500,
+        prepared_statement_cache_size: int = 100,
+        pgbouncer: bool = False,
     ) -> None:
-        self.engine: AsyncEngine = create_async_engine(
-            url=url,
+        self.pool_adaptive = pool_adaptive
+        self.pool_limit = max(pool_budget // workers, 1)
+        self.pool_min_idle = min(pool_min_idle, self.pool_limit)
+        self.pool_adapt_interval = pool_adapt_interval
+        if pool_adaptive:
+            # The whole share of the budget in the queue, trimmed by idle_target
+            pool_size, max_overflow = self.pool_limit, 0
+
+        engine_options = dict(
             echo=echo,
             echo_pool=echo_pool,
+            poolclass=InstrumentedPool,
+            query_cache_size=compiled_cache_size,
+            connect_args=_connect_args(prepared_statement_cache_size, pgbouncer),
+        )
+
+        self.engine: AsyncEngine = create_async_engine(
+            url=url,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            **engine_options,
         )
+        if pool_adaptive:
+            self.engine.pool.idle_target = self.pool_min_idle
 
-        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine,
-            autoflush=False,
-            autocommit=False,
-            expire_on_commit=False,
-        )
+        self.read_engine = _read_only(self.engine)
+        self.session_factory = _make_session_factory(self.engine)
+
+        self.replicas = [
+            Replica(
+                create_async_engine(
+                    url=replica_url,
+                    pool_size=replica_pool_size,
+                    max_overflow=replica_max_overflow,
+                    **engine_options,
+                )
+            )
+            for replica_url in replica_urls
+        ]
+        self.replica_check_interval = replica_check_interval
+        self.replica_max_lag = replica_max_lag
+        self.read_your_writes_cookie = read_your_writes_cookie
+
+        self._next_replica = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._adapt_task: Optional[asyncio.Task] = None
 
     async def dispose(self):
         await self.engine.dispose()
+        for replica in self.replicas:
+            await replica.engine.dispose()
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session_factory() as session:
             yield session
 
+    def reads_from_primary(self, request: Optional[Request]) -> bool:
+        # Set by ReadYourWritesMiddleware after the client's own change
+        if request is None:
+            return False
+        try:
+            until = float(request.cookies.get(self.read_your_writes_cookie, 0))
+        except ValueError:
+            return False
+        return until > time.time()
+
+    def _healthy_replicas(self) -> list[Replica]:
+        # Round-robin: every call starts with the next replica
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return []
+        start = next(self._next_replica) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    @asynccontextmanager
+    async def read_connection(
+        self,
+        request: Optional[Request] = None,
+        replicas: bool = True,
+    ) -> AsyncIterator[AsyncConnection]:
+        """Read-only connection, to a healthy replica if there is one.
+
+        Falls back to the next replica, then to the primary, when the
+        connection fails; reads of a client that just wrote, within the
+        read-your-writes window, go to the primary. Each call may choose
+        another replica, a ReadSession keeps the first one chosen.
+        """
+        if replicas and not self.reads_from_primary(request):
+            for replica in self._healthy_replicas():
+                # Connect now, while another server can still be chosen
+                connection = replica.read_engine.connect()
+                try:
+                    await connection.start()
+                except (OSError, DBAPIError) as ex:
+                    self._set_health(replica, False, reason=repr(ex))
+                    continue
+
+                try:
+                    yield connection
+                finally:
+                    await connection.close()
+                return
+
+        async with self.read_engine.connect() as connection:
+            yield connection
+
+    def reader(self) -> ReadSession:
+        """Light reads on the primary"""
+        return ReadSession(lambda: self.read_connection(replicas=False))
+
+    def reader_ro(self, request: Request) -> ReadSession:
+        """Light reads on one of the replicas, see read_connection()"""
+        return ReadSession(lambda: self.read_connection(request))
+
+    def readers(self) -> list[ReadSession]:
+        """Light reads on the primary, then on each healthy replica"""
+        engines = [self.read_engine]
+        engines.extend(
+            replica.read_engine for replica in self.replicas if replica.healthy
+        )
+        return [ReadSession(engine.connect) for engine in engines]
+
+    def _set_health(self, replica: Replica, healthy: bool, reason: str) -> None:
+        if replica.healthy != healthy:
+            log.warning(
+                "Replica %s is %s: %s",
+                replica.name,
+                "back in use" if healthy else "out of use",
+                reason,
+            )
+        replica.healthy = healthy
+
+    async def check_replica(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.replica_check_interval):
+                async with replica.engine.connect() as connection:
+                    lag = (await connection.execute(REPLICA_LAG)).scalar()
+        except (OSError, DBAPIError, TimeoutError) as ex:
+            self._set_health(replica, False, reason=repr(ex))
+            return
+
+        if lag is None or lag > self.replica_max_lag:
+            self._set_health(replica, False, reason=f"replay lag {lag} s")
+        else:
+            self._set_health(replica, True, reason=f"replay lag {lag} s")
+
+    async def check_replicas(self) -> None:
+        await asyncio.gather(*(self.check_replica(r) for r in self.replicas))
+
+    async def _health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self.replica_check_interval)
+            await self.check_replicas()
+
+    @staticmethod
+    async def _open_connections(engine: AsyncEngine, count: int) -> None:
+        pool = engine.pool
+        if pool.idle_target is not None:
+            count = min(count, pool.idle_target)
+        count = min(count, pool.size())
+
+        # All checked out at once, so each one is a new connection
+        connections = [engine.connect() for _ in range(count)]
+        results = await asyncio.gather(
+            *(connection.start() for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if not isinstance(result, BaseException):
+                await connection.close()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def open_connections(self, count: int) -> None:
+        """Open up to 'count' connections in the primary and healthy replica
+        pools, kept for the first requests: connecting, authenticating and
+        the driver's type introspection are then done."""
+        engines = [self.engine]
+        engines.extend(replica.engine for replica in self.replicas if replica.healthy)
+        await asyncio.gather(
+            *(self._open_connections(engine, count) for engine in engines)
+        )
+
+    def adapt_pool(self) -> None:
+        pool = self.engine.pool
+        pool.idle_target = adapted_idle_target(
+            peak=pool.take_peak(),
+            minimum=self.pool_min_idle,
+            limit=self.pool_limit,
+        )
+
+    async def _adapt_pool(self) -> None:
+        while True:
+            await asyncio.sleep(self.pool_adapt_interval)
+            self.adapt_pool()
+
+    def export_metrics(self, exposition: Exposition) -> None:
+        self.engine.pool.export(exposition, pool="primary")
+        for number, replica in enumerate(self.replicas):
+            replica.engine.pool.export(exposition, pool=f"replica{number}")
+            exposition.gauge(
+                "db_replica_healthy",
+                "Whether the replica is in use",
+                int(replica.healthy),
+                pool=f"replica{number}",
+            )
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            await self.check_replicas()
+            self._task = asyncio.create_task(self._health_checks())
+        if self.pool_adaptive and self._adapt_task is None:
+            self._adapt_task = asyncio.create_task(self._adapt_pool())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._adapt_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._adapt_task = None
+
 
 db_helper = DatabaseHelper(
     url=str(settings.db.url),
@@ -48,4 +382,18 @@ db_helper = DatabaseHelper(
     echo_pool=settings.db.echo_pool,
     pool_size=settings.db.pool_size,
     max_overflow=settings.db.max_overflow,
+    replica_urls=[str(url) for url in settings.db.replica_urls],
+    replica_pool_size=settings.db.replica_pool_size,
+    replica_max_overflow=settings.db.replica_max_overflow,
+    replica_check_interval=settings.db.replica_check_interval,
+    replica_max_lag=settings.db.replica_max_lag,
+    read_your_writes_cookie=settings.db.read_your_writes_cookie,
+    pool_adaptive=settings.db.pool_adaptive,
+    pool_budget=settings.db.pool_budget,
+    workers=settings.db.workers,
+    pool_min_idle=settings.db.pool_min_idle,
+    pool_adapt_interval=settings.db.pool_adapt_interval,
+    compiled_cache_size=settings.db.compiled_cache_size,
+    prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+    pgbouncer=settings.db.pgbouncer,
 )
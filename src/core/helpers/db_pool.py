@@ -0,0 +1,86 @@
+import math
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .metrics import Exposition, Histogram
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """The engines' queue pool, timing every checkout.
+
+    With 'idle_target' set, 'pool_size' is only a hard limit: connections
+    are opened on demand up to it, and the ones returned beyond
+    'idle_target' idle connections are closed instead of kept.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram(
+            name="db_pool_checkout_seconds",
+            description="Time to check a connection out of the pool",
+        )
+        self.timeouts = 0
+        self.idle_target: Optional[int] = None
+        # Most connections in use at once since the last take_peak()
+        self._peak_in_use = 0
+
+    def connect(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started_at)
+        self._peak_in_use = max(self._peak_in_use, self.checkedout())
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        if self.idle_target is not None and self._pool.qsize() >= self.idle_target:
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+            return
+        super()._do_return_conn(record)
+
+    def take_peak(self) -> int:
+        peak, self._peak_in_use = self._peak_in_use, self.checkedout()
+        return peak
+
+    def export(self, exposition: Exposition, pool: str) -> None:
+        in_use, idle = self.checkedout(), self.checkedin()
+        kept = self.size() if self.idle_target is None else self.idle_target
+        exposition.histogram(self.checkout_wait, pool=pool)
+        exposition.counter(
+            "db_pool_checkout_timeouts_total",
+            "Checkouts given up after waiting 'pool_timeout' seconds",
+            self.timeouts,
+            pool=pool,
+        )
+        exposition.gauge("db_pool_in_use", "Connections checked out", in_use, pool=pool)
+        exposition.gauge(
+            "db_pool_idle", "Connections open in the pool", idle, pool=pool
+        )
+        exposition.gauge(
+            "db_pool_overflow",
+            "Open connections beyond the ones the pool keeps",
+            max(in_use + idle - kept, 0),
+            pool=pool,
+        )
+        exposition.gauge(
+            "db_pool_kept",
+            "Connections kept open between checkouts",
+            kept,
+            pool=pool,
+        )
+
+
+def adapted_idle_target(peak: int, minimum: int, limit: int) -> int:
+    # A quarter of headroom above the recent peak, so a slightly busier
+    # minute still finds its connections open
+    return max(minimum, min(limit, math.ceil(peak * 1.25)))
@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import csv
+from typing import AsyncIterator, BinaryIO
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import logger as log
+from . import db_helper
+
+STAGING_TABLE = "products_import"
+IMPORT_COLUMNS = ("id", "name", "description", "price", "category_id")
+REQUIRED_COLUMNS = {"name", "description", "price", "category_id"}
+
+
+async def _split_header(
+    source: AsyncIterator[bytes],
+) -> tuple[list[str], AsyncIterator[bytes]]:
+    # Read just enough of the upload to parse the header line,
+    # the rest of the stream goes to COPY untouched.
+    buffer = b""
+    async for chunk in source:
+        buffer += chunk
+        if b"\n" in buffer:
+            break
+    header_line, _, rest = buffer.partition(b"\n")
+
+    columns = next(csv.reader([header_line.decode("utf-8-sig").strip()]), [])
+    columns = [name.strip() for name in columns]
+    unknown = set(columns) - set(IMPORT_COLUMNS)
+    if (
+        unknown
+        or not REQUIRED_COLUMNS <= set(columns)
+        or len(set(columns)) != len(columns)
+    ):
+        raise ValueError(
+            f"CSV header must consist of {', '.join(IMPORT_COLUMNS)} "
+            f"('id' is optional). Got: {', '.join(columns)}"
+        )
+
+    async def body() -> AsyncIterator[bytes]:
+        if rest:
+            yield rest
+        async for chunk in source:
+            yield chunk
+
+    return columns, body()
+
+
+async def import_products_helper(
+    session: AsyncSession,
+    source: AsyncIterator[bytes],
+) -> dict[str, int]:
+    """Load a CSV catalog with COPY and merge it into 'products'.
+
+    Rows with an 'id' replace the existing product, rows without one are
+    created. Rows that reference a missing category are rejected.
+    """
+    columns, body = await _split_header(source)
+
+    await session.execute(
+        text(
+            f"""
+            CREATE TEMP TABLE {STAGING_TABLE} (
+                id integer,
+                name varchar(128) NOT NULL,
+                description varchar(512) NOT NULL,
+                price integer NOT NULL CHECK (price > 0),
+                category_id integer NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+    )
+
+    # COPY FROM STDIN straight from the stream, on the session's own connection
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    status = await raw_connection.driver_connection.copy_to_table(
+        STAGING_TABLE,
+        source=body,
+        columns=columns,
+        format="csv",
+    )
+    total = int(status.split()[-1])
+
+    # One set-based merge, referential integrity is checked in SQL
+    result = await session.execute(
+        text(
+            f"""
+            WITH merged AS (
+                INSERT INTO products (id, name, description, price, category_id)
+                SELECT
+                    coalesce(s.id, nextval(pg_get_serial_sequence('products', 'id'))),
+                    s.name,
+                    s.description,
+                    s.price,
+                    s.category_id
+                FROM {STAGING_TABLE} AS s
+                WHERE EXISTS (SELECT 1 FROM categories AS c WHERE c.id = s.category_id)
+                ON CONFLICT (id) DO UPDATE SET
+                    name = excluded.name,
+                    description = excluded.description,
+                    price = excluded.price,
+                    category_id = excluded.category_id
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                count(*) FILTER (WHERE inserted) AS inserted,
+                count(*) FILTER (WHERE NOT inserted) AS updated
+            FROM merged
+            """
+        )
+    )
+    inserted, updated = result.one()
+
+    if "id" in columns:
+        # Explicit ids bypass the sequence, move it past them
+        await session.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence('products', 'id'), "
+                "(SELECT max(id) FROM products))"
+            )
+        )
+
+    await session.commit()
+
+    log.info(
+        "Imported products: %s rows, %s inserted, %s updated",
+        total,
+        inserted,
+        updated,
+    )
+    return {
+        "total": total,
+        "inserted": inserted,
+        "updated": updated,
+        "rejected": total - inserted - updated,
+    }
+
+
+async def _read_file(file: BinaryIO, chunk_size: int = 1 << 20) -> AsyncIterator[bytes]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+async def _main(path: str) -> None:
+    async for session in db_helper.session_getter():
+        with open(path, "rb") as file:
+            print(await import_products_helper(session, _read_file(file)))
+    await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    # cd src/ && python -m core.helpers.import_products_helper catalog.csv
+    parser = argparse.ArgumentParser(description="Import a CSV product catalog.")
+    parser.add_argument("path", help="CSV file with a header row")
+    asyncio.run(_main(parser.parse_args().path))
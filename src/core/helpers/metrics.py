@@ -0,0 +1,108 @@
+import bisect
+from typing import Any
+
+# Seconds, from sub-millisecond waits to a saturated pool
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Distribution of observed durations, in the Prometheus layout:
+    cumulative bucket counts keyed by upper bound, plus count and sum."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket and a last one for '+Inf'
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*self.buckets, float("inf")), self._counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+def _format_labels(labels: dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+class Exposition:
+    """Samples in the Prometheus text format, grouped by metric name
+    whatever order they are added in."""
+
+    def __init__(self, **labels: Any) -> None:
+        # Added to every sample, e.g. the worker
+        self.labels = labels
+        # name -> (type, description, sample lines)
+        self._families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def _add(
+        self,
+        kind: str,
+        name: str,
+        description: str,
+        sample: str,
+        value: float,
+        labels: dict[str, Any],
+    ) -> None:
+        _, _, lines = self._families.setdefault(name, (kind, description, []))
+        lines.append(f"{sample}{_format_labels({**self.labels, **labels})} {value}")
+
+    def gauge(self, name: str, description: str, value: float, **labels) -> None:
+        self._add("gauge", name, description, name, value, labels)
+
+    def counter(self, name: str, description: str, value: float, **labels) -> None:
+        # Named '..._total' by convention
+        self._add("counter", name, description, name, value, labels)
+
+    def histogram(self, histogram: Histogram, **labels) -> None:
+        snapshot = histogram.snapshot()
+        name, description = histogram.name, histogram.description
+        for bound, count in snapshot["buckets"].items():
+            le = "+Inf" if bound == "inf" else bound
+            self._add(
+                "histogram",
+                name,
+                description,
+                f"{name}_bucket",
+                count,
+                {**labels, "le": le},
+            )
+        self._add(
+            "histogram", name, description, f"{name}_sum", snapshot["sum"], labels
+        )
+        self._add(
+            "histogram", name, description, f"{name}_count", snapshot["count"], labels
+        )
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, description, samples) in self._families.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
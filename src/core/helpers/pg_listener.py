@@ -0,0 +1,90 @@
+import asyncio
+from typing import Callable, Optional
+
+import asyncpg
+from sqlalchemy import make_url
+
+from core.config import settings
+from core.logger import logger as log
+
+
+class PgListener:
+    """One LISTEN connection per worker, shared by the in-process caches.
+
+    Subscribers register a callback per channel and an 'on_connect' hook,
+    called each time the connection is (re)established: notifications sent
+    while nobody was listening are lost, so caches must drop what they hold.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 5.0) -> None:
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+
+        # channel -> callbacks receiving the notification payload
+        self._channels: dict[str, list[Callable[[str], None]]] = {}
+        self._on_connect: list[Callable[[], None]] = []
+        self._connected = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def subscribe(
+        self,
+        channel: str,
+        callback: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._channels.setdefault(channel, []).append(callback)
+        if on_connect is not None:
+            self._on_connect.append(on_connect)
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for callback in self._channels.get(channel, []):
+            callback(payload)
+
+    async def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._channels:
+                    await connection.add_listener(channel, self._dispatch)
+
+                for on_connect in self._on_connect:
+                    on_connect()
+                self._connected = True
+                log.info("Listening on %s", ", ".join(map(repr, self._channels)))
+                await closed.wait()
+            except (OSError, asyncpg.PostgresError) as ex:
+                log.warning("LISTEN connection failed: %r", ex)
+            finally:
+                self._connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def start(self) -> None:
+        if self._task is None and self._channels:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+pg_listener = PgListener(
+    dsn=make_url(str(settings.db.url))
+    .set(drivername="postgresql")
+    .render_as_string(hide_password=False),
+    reconnect_delay=settings.db.listen_reconnect_delay,
+)
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from core.logger import logger as log
+from .db_helper import db_helper
+
+
+class TokenBucketStore(Protocol):
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        """Take a token from the bucket, returns 0 or the seconds to wait"""
+
+
+class MemoryTokenBuckets:
+    """Token buckets of one worker: O(1) per request, bounded in memory.
+
+    Keys are spread over shards, each an LRU of at most max_keys / shards
+    buckets. An evicted bucket comes back full, as it would after a pause.
+    """
+
+    def __init__(self, shards: int, max_keys: int) -> None:
+        # key -> (tokens left, monotonic time of the last refill)
+        self._shards: list[OrderedDict[str, tuple[float, float]]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+        self._shard_size = max(1, max_keys // shards)
+
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        tokens, refilled_at = shard.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - refilled_at) * rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+
+        shard[key] = (tokens, now)
+        if len(shard) > self._shard_size:
+            shard.popitem(last=False)
+        return wait
+
+
+class PostgresTokenBuckets:
+    """Token buckets shared by every worker, in the UNLOGGED table
+    'rate_limit_buckets'. The refill and the take are one statement:
+    when the bucket is empty the WHERE fails and no row is returned."""
+
+    TAKE = text(
+        """
+        INSERT INTO rate_limit_buckets AS b (key, tokens, refilled_at)
+        VALUES (:key, :capacity - 1, now())
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = least(
+                :capacity,
+                b.tokens + extract(epoch FROM now() - b.refilled_at) * :rate
+            ) - 1,
+            refilled_at = now()
+        WHERE least(
+            :capacity,
+            b.tokens + extract(epoch FROM now() - b.refilled_at) * :rate
+        ) >= 1
+        RETURNING b.tokens
+        """
+    )
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        cleanup_interval: float,
+    ) -> None:
+        self.session_factory = session_factory
+        self.cleanup_interval = cleanup_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        # Outside the request's session: counted even if the request fails
+        async with self.session_factory() as session:
+            result = await session.execute(
+                self.TAKE,
+                {"key": key, "capacity": capacity, "rate": rate},
+            )
+            allowed = result.first() is not None
+            await session.commit()
+        return 0.0 if allowed else 1 / rate
+
+    async def _cleanup(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                async with self.session_factory() as session:
+                    # Idle long enough to be full again, same as no row
+                    await session.execute(
+                        text(
+                            "DELETE FROM rate_limit_buckets "
+                            "WHERE refilled_at < now() - make_interval(secs => :idle)"
+                        ),
+                        {"idle": self.cleanup_interval},
+                    )
+                    await session.commit()
+            except (OSError, DBAPIError) as ex:
+                log.warning("Rate limit buckets cleanup failed: %r", ex)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._cleanup())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class RateLimiter:
+    def __init__(self, store: TokenBucketStore) -> None:
+        self.store = store
+
+    async def hit(self, *limits: tuple[str, int, float]) -> float:
+        """Take a token for every (key, capacity, rate per second) in turn.
+
+        Returns 0 when the request is allowed, otherwise the seconds to wait.
+        The first empty bucket stops it, so later ones are not charged.
+        """
+        for key, capacity, rate in limits:
+            wait = await self.store.take(key, capacity, rate)
+            if wait:
+                return wait
+        return 0.0
+
+    async def start(self) -> None:
+        if isinstance(self.store, PostgresTokenBuckets):
+            await self.store.start()
+
+    async def stop(self) -> None:
+        if isinstance(self.store, PostgresTokenBuckets):
+            await self.store.stop()
+
+
+def _make_store() -> TokenBucketStore:
+    if settings.rate_limit.backend == "postgres":
+        return PostgresTokenBuckets(
+            session_factory=db_helper.session_factory,
+            cleanup_interval=settings.rate_limit.cleanup_interval,
+        )
+    return MemoryTokenBuckets(
+        shards=settings.rate_limit.shards,
+        max_keys=settings.rate_limit.max_keys,
+    )
+
+
+rate_limiter = RateLimiter(store=_make_store())
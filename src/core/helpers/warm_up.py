@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, Sequence
+
+from sqlalchemy.orm import configure_mappers
+
+from core.config import settings
+from core.logger import logger as log
+from .db_helper import DatabaseHelper, ReadSession, db_helper
+
+HotQuery = Callable[[ReadSession], Awaitable[object]]
+
+
+class WarmUp:
+    """Work of the first requests, done before the worker reports ready.
+
+    Configures the mappers, opens 'connections' connections in every pool
+    and runs the hot queries once per database: SQLAlchemy caches their
+    compiled form per engine, the driver prepares them per connection.
+    Retried every 'retry_interval' seconds until it succeeds.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseHelper,
+        connections: int,
+        retry_interval: float,
+    ) -> None:
+        self.db = db
+        self.connections = connections
+        self.retry_interval = retry_interval
+
+        self.ready = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self, queries: Sequence[HotQuery]) -> None:
+        started_at = time.monotonic()
+        configure_mappers()
+        await self.db.open_connections(self.connections)
+
+        for reader in self.db.readers():
+            for query in queries:
+                await query(reader)
+
+        log.info("Warmed up in %.3f s", time.monotonic() - started_at)
+
+    async def _run_until_done(self, queries: Sequence[HotQuery]) -> None:
+        while True:
+            try:
+                await self.run(queries)
+                break
+            except Exception:
+                # Whatever the cause, the worker must not stay unready for good
+                log.exception("Warm-up failed, retrying in %s s", self.retry_interval)
+                await asyncio.sleep(self.retry_interval)
+        self.ready = True
+
+    @staticmethod
+    def _log_exit(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            log.error(
+                "Warm-up task died, the worker stays unready",
+                exc_info=task.exception(),
+            )
+
+    def start(self, queries: Sequence[HotQuery]) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_until_done(queries))
+            self._task.add_done_callback(self._log_exit)
+
+    async def stop(self) -> None:
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+warm_up = WarmUp(
+    db=db_helper,
+    connections=settings.warm_up.connections,
+    retry_interval=settings.warm_up.retry_interval,
+)
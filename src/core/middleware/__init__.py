@@ -0,0 +1,13 @@
+__all__ = (
+    "CompressionMiddleware",
+    "ReadYourWritesMiddleware",
+    "make_compression_cache",
+    "make_compression_codecs",
+)
+
+from .compression import (
+    CompressionMiddleware,
+    make_cache as make_compression_cache,
+    make_codecs as make_compression_codecs,
+)
+from .read_your_writes import ReadYourWritesMiddleware
@@ -0,0 +1,299 @@
+import hashlib
+import zlib
+from typing import Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from core.helpers.lru_cache import LRUTTLCache
+
+try:
+    import brotli
+except ImportError:  # optional, 'br' is not offered without it
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, 'zstd' is not offered without it
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk, flushed so the client can decode it right away"""
+
+    def finish(self) -> bytes:
+        """End of the stream"""
+
+
+class Codec(Protocol):
+    # Content-Encoding token
+    name: str
+
+    def compress(self, body: bytes) -> bytes:
+        """Compress a complete body"""
+
+    def compressor(self) -> StreamCompressor:
+        """New compressor for a streamed body"""
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level: int) -> None:
+        self.level = level
+
+    def compress(self, body: bytes) -> bytes:
+        return zlib.compress(body, self.level, wbits=31)
+
+    def compressor(self) -> StreamCompressor:
+        return _ZlibStream(zlib.compressobj(self.level, wbits=31))
+
+
+class _ZlibStream:
+    def __init__(self, compressobj) -> None:
+        self._compressobj = compressobj
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressobj.compress(chunk) + self._compressobj.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressobj.flush()
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, quality: int) -> None:
+        self.quality = quality
+
+    def compress(self, body: bytes) -> bytes:
+        return brotli.compress(body, quality=self.quality)
+
+    def compressor(self) -> StreamCompressor:
+        return _BrotliStream(brotli.Compressor(quality=self.quality))
+
+
+class _BrotliStream:
+    def __init__(self, compressor) -> None:
+        self._compressor = compressor
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level: int) -> None:
+        self._context = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, body: bytes) -> bytes:
+        return self._context.compress(body)
+
+    def compressor(self) -> StreamCompressor:
+        return _ZstdStream(self._context.compressobj())
+
+
+class _ZstdStream:
+    def __init__(self, compressobj) -> None:
+        self._compressobj = compressobj
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressobj.compress(chunk) + self._compressobj.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressobj.flush()
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    """'gzip, br;q=0.8, *;q=0' -> {'gzip': 1.0, 'br': 0.8, '*': 0.0}"""
+    accepted = {}
+    for item in value.split(","):
+        name, *params = item.strip().split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, number = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding the client accepts.
+
+    Complete bodies of at least 'minimum_size' bytes are compressed in one
+    go, through 'cache' when given: keyed by encoding and body digest, so
+    the same hot response is compressed once, not on every request.
+    Streamed bodies are compressed chunk by chunk, each flushed as it comes.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        codecs: list[Codec],
+        minimum_size: int,
+        cache: Optional[LRUTTLCache[tuple[str, bytes], bytes]] = None,
+        cache_max_body: int = 0,
+    ) -> None:
+        self.app = app
+        self.codecs = codecs
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.cache_max_body = cache_max_body
+
+    def negotiate(self, accept_encoding: str) -> Optional[Codec]:
+        accepted = parse_accept_encoding(accept_encoding)
+        default = accepted.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for codec in self.codecs:
+            quality = accepted.get(codec.name, default)
+            if quality > best_quality:
+                best, best_quality = codec, quality
+        return best
+
+    def compress(self, codec: Codec, body: bytes) -> bytes:
+        if self.cache is None or len(body) > self.cache_max_body:
+            return codec.compress(body)
+
+        key = (codec.name, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = codec.compress(body)
+            self.cache.set(key, compressed)
+        return compressed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        codec = self.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self, codec, send)(scope, receive)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        codec: Codec,
+        send: Send,
+    ) -> None:
+        self.middleware = middleware
+        self.codec = codec
+        self.send = send
+
+        self.start_message: Optional[Message] = None
+        # None until the first body message decides it
+        self.compressing: Optional[bool] = None
+        self.stream: Optional[StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    @staticmethod
+    def is_compressible(headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def set_encoding(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.codec.name
+        headers.add_vary_header("Accept-Encoding")
+        # Another representation, byte for byte, than the one a strong ETag names
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held until the first body message tells how to send it
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressing is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            self.compressing = self.is_compressible(headers) and (
+                more_body or len(body) >= self.middleware.minimum_size
+            )
+            if not self.compressing:
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.set_encoding(headers)
+            if not more_body:
+                body = self.middleware.compress(self.codec, body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            del headers["Content-Length"]
+            self.stream = self.codec.compressor()
+            await self.send(self.start_message)
+
+        if self.stream is None:
+            await self.send(message)
+            return
+
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        await self.send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+
+def make_codecs() -> list[Codec]:
+    config = settings.compression
+    available = {"gzip": lambda: GzipCodec(level=config.gzip_level)}
+    if brotli is not None:
+        available["br"] = lambda: BrotliCodec(quality=config.brotli_quality)
+    if zstandard is not None:
+        available["zstd"] = lambda: ZstdCodec(level=config.zstd_level)
+    return [available[name]() for name in config.encodings if name in available]
+
+
+def make_cache() -> Optional[LRUTTLCache[tuple[str, bytes], bytes]]:
+    config = settings.compression
+    if not config.cache_enabled:
+        return None
+    return LRUTTLCache(maxsize=config.cache_size, ttl=config.cache_ttl)
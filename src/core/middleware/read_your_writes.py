@@ -0,0 +1,37 @@
+import math
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE"})
+
+
+class ReadYourWritesMiddleware:
+    """Sends the reads of a client that just changed something to the
+    primary for 'window' seconds, the time replicas need to catch up.
+
+    Every successful unsafe request sets a cookie holding the end of the
+    window, checked by DatabaseHelper.read_connection.
+    """
+
+    def __init__(self, app: ASGIApp, cookie_name: str, window: float) -> None:
+        self.app = app
+        self.cookie_name = cookie_name
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_marked(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{self.cookie_name}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_marked)
@@ -1,8 +1,10 @@
 __all__ = (
     "Base",
     "AccessToken",
+    "CatalogVersion",
     "Category",
     "Product",
+    "RateLimitBucket",
     "User",
     # "Profile",
 )
@@ -14,3 +16,5 @@ from .user import User
 # from .profile import Profile
 from .category import Category
 from .product import Product
+from .catalog_version import CatalogVersion
+from .rate_limit_bucket import RateLimitBucket
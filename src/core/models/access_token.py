@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from fastapi_users_db_sqlalchemy.access_token import (
     SQLAlchemyAccessTokenDatabase,
@@ -12,6 +12,7 @@ from .base import Base
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
+    from core.authentication.access_token_cache import AccessTokenCache
 
 
 class AccessToken(Base, SQLAlchemyBaseAccessTokenTable[UserIdType]):
@@ -24,5 +25,9 @@ class AccessToken(Base, SQLAlchemyBaseAccessTokenTable[UserIdType]):
     )
 
     @classmethod
-    def get_db(cls, session: "AsyncSession"):
+    def get_db(
+        cls, session: "AsyncSession", cache: Optional["AccessTokenCache"] = None
+    ):
+        if cache is not None:
+            return cache.get_db(session, cls)
         return SQLAlchemyAccessTokenDatabase(session, cls)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, String, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class CatalogVersion(Base):
+    """One row per catalog table, bumped in the writing transaction by the
+    'bump_catalog_version' trigger after every statement changing the table"""
+
+    __tablename__ = "catalog_versions"
+
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default="0",
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -5,20 +5,22 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
 from .mixins.id_int_pk import IdIntPkMixin
+from .mixins.updated_at import UpdatedAtMixin
 
 if TYPE_CHECKING:
     from .product import Product
 
 
-class Category(Base, IdIntPkMixin):
+class Category(Base, IdIntPkMixin, UpdatedAtMixin):
     __tablename__ = "categories"
 
     name: Mapped[str] = mapped_column(String(32), unique=True, index=True)
     description: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
 
     parent_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("categories.id"),
+        ForeignKey("categories.id", ondelete="CASCADE"),
         nullable=True,
+        index=True,
     )
 
     # Attitude to parent category
@@ -28,18 +30,20 @@ class Category(Base, IdIntPkMixin):
         back_populates="subcategories",
     )
 
-    # List of subcategories
+    # List of subcategories, deleted by 'ON DELETE CASCADE' in the database
     subcategories: Mapped[List["Category"]] = relationship(
         "Category",
         back_populates="parent",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
-    # Products related to category
+    # Products related to category, deleted by 'ON DELETE CASCADE' in the database
     products: Mapped[List["Product"]] = relationship(
         "Product",
         back_populates="category",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self):
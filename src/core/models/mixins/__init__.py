@@ -1,4 +1,5 @@
-__all__ = ("IdIntPkMixin", "UserRelationMixin")
+__all__ = ("IdIntPkMixin", "UpdatedAtMixin", "UserRelationMixin")
 
 from .id_int_pk import IdIntPkMixin
+from .updated_at import UpdatedAtMixin
 from .user_rel_mix import UserRelationMixin
@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import FetchedValue, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class UpdatedAtMixin:
+    # Set by the 'set_updated_at' trigger on every UPDATE of the row
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
+        nullable=False,
+    )
@@ -1,10 +1,12 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from .base import Base
 from .mixins.id_int_pk import IdIntPkMixin
+from .mixins.updated_at import UpdatedAtMixin
 
 if TYPE_CHECKING:
     from .category import Category
@@ -13,7 +15,32 @@ if TYPE_CHECKING:
 #     from .order_product_association import OrderProductAssociation
 
 
-class Product(Base, IdIntPkMixin):
+class Product(Base, IdIntPkMixin, UpdatedAtMixin):
+    __table_args__ = (
+        # Filtering by category combined with the keyset sort orders
+        Index("ix_products_category_id_id", "category_id", "id"),
+        Index("ix_products_category_id_price_id", "category_id", "price", "id"),
+        Index("ix_products_category_id_name_id", "category_id", "name", "id"),
+        # 'LIKE prefix%' can only use a btree index with pattern ops
+        Index(
+            "ix_products_name_pattern",
+            "name",
+            postgresql_ops={"name": "varchar_pattern_ops"},
+        ),
+        # Full-text and typo-tolerant search
+        Index(
+            "ix_products_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     name: Mapped[str] = mapped_column(String(128), index=True)
     description: Mapped[str] = mapped_column(String(512))
     price: Mapped[int] = mapped_column(Integer, index=True)
@@ -23,6 +50,17 @@ class Product(Base, IdIntPkMixin):
         nullable=False,
     )
 
+    # Maintained by PostgreSQL, never loaded unless requested
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', name), 'A') || "
+            "setweight(to_tsvector('simple', description), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     category: Mapped["Category"] = relationship(
         "Category",
         back_populates="products",
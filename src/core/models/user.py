@@ -5,7 +5,7 @@ from fastapi_users_db_sqlalchemy import (
     SQLAlchemyBaseUserTable,
     SQLAlchemyUserDatabase,
 )
-from sqlalchemy import String, TIMESTAMP, func
+from sqlalchemy import Index, String, TIMESTAMP, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.types.user_id import UserIdType
@@ -24,7 +24,7 @@ class User(Base, IdIntPkMixin, SQLAlchemyBaseUserTable[UserIdType]):
     middle_name: Mapped[str] = mapped_column(String(32), nullable=True)
     birth_date: Mapped[date] = mapped_column(TIMESTAMP, nullable=True, default=None)
     registered_on: Mapped[datetime] = mapped_column(
-        TIMESTAMP, nullable=False, server_default=func.now()
+        TIMESTAMP, nullable=False, server_default=func.now(), index=True
     )
 
     @classmethod
@@ -38,3 +38,11 @@ class User(Base, IdIntPkMixin, SQLAlchemyBaseUserTable[UserIdType]):
     #     uselist=False,
     #     cascade="all, delete",
     # )
+
+
+# Case-insensitive e-mail prefix filter: 'lower(email) LIKE prefix%'
+Index(
+    "ix_users_email_lower_pattern",
+    func.lower(User.email).label("email_lower"),
+    postgresql_ops={"email_lower": "varchar_pattern_ops"},
+)
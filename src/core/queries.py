@@ -0,0 +1,55 @@
+"""Hot statements, each defined once as a lambda statement.
+
+A lambda statement is cached on the code of its lambda: after the first
+call neither the select() nor its cache key is built again, the values
+read from the closure are bound to the compiled statement SQLAlchemy
+already holds. They are bound parameters, never literals, so a single
+statement, prepared once per connection by asyncpg, serves every id.
+"""
+
+from typing import Sequence, Type, TypeVar
+
+from sqlalchemy import StatementLambdaElement, lambda_stmt, select
+
+from core.models import Base, CatalogVersion, Category, Product
+
+T = TypeVar("T", bound=Base)
+
+
+def object_by_id(model: Type[T], object_id: int) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(model).where(model.id == object_id))
+
+
+def product_row_by_id(product_id: int) -> StatementLambdaElement:
+    # In the field order of ProductRead
+    return lambda_stmt(
+        lambda: select(
+            Product.name,
+            Product.description,
+            Product.price,
+            Product.category_id,
+            Product.id,
+        ).where(Product.id == product_id)
+    )
+
+
+def category_nodes() -> StatementLambdaElement:
+    # In the field order of CategoryNode
+    return lambda_stmt(
+        lambda: select(
+            Category.name,
+            Category.description,
+            Category.parent_id,
+            Category.id,
+        ).order_by(Category.id)
+    )
+
+
+def catalog_versions(tables: Sequence[str]) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(
+            CatalogVersion.table_name,
+            CatalogVersion.version,
+            CatalogVersion.updated_at,
+        ).where(CatalogVersion.table_name.in_(tables))
+    )
@@ -1,8 +1,11 @@
 from typing import Optional, TYPE_CHECKING, List
 from pydantic import BaseModel, RootModel, ConfigDict, Field
+from typing_extensions import TypedDict
+
+from .pagination import CursorPage
 
 if TYPE_CHECKING:
-    from .product import ProductRead
+    from .product import ProductRead, ProductRow
 
 
 class CategoryBase(BaseModel):
@@ -78,6 +81,16 @@ class SubCategoryBase(CategoryRead):
     )
 
 
+class CategoryReadTree(CategoryRead):
+    """Schema for reading a category with its whole subtree"""
+
+    subcategories: List["CategoryReadTree"] = Field(
+        default_factory=list,
+        title="Subcategories",
+        description="Nested subcategories down to the requested depth.",
+    )
+
+
 class CategoryReadWithProduct(CategoryRead):
     """Schema for reading a category with a list of products"""
 
@@ -86,8 +99,46 @@ class CategoryReadWithProduct(CategoryRead):
         title="Category Products",
         description="List of products associated with this category.",
     )
+    product_count: int = Field(
+        default=0,
+        title="Product Count",
+        description="Number of products in this category, embedded or not.",
+        examples=[42],
+        ge=0,
+    )
+
+
+class CategoryReadPageWithProducts(CursorPage[CategoryReadWithProduct]):
+    """Schema for reading a page of categories with their first products"""
+
+    pass
+
+
+class CategoryRow(TypedDict):
+    """Category row serialized like CategoryRead, without validation"""
+
+    name: str
+    description: Optional[str]
+    parent_id: Optional[int]
+    id: int
+
+
+class CategoryRowWithProducts(CategoryRow):
+    """Category row serialized like CategoryReadWithProduct"""
+
+    products: List["ProductRow"]
+    product_count: int
+
+
+class CategoryRowPageWithProducts(TypedDict):
+    """Page of category rows serialized like CategoryReadPageWithProducts"""
+
+    items: List[CategoryRowWithProducts]
+    next_cursor: Optional[str]
 
 
-from .product import ProductRead
+from .product import ProductRead, ProductRow
 
 CategoryReadWithProduct.model_rebuild()
+CategoryReadPageWithProducts.model_rebuild()
+CategoryReadTree.model_rebuild()
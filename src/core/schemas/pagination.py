@@ -0,0 +1,21 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Base schema for a page of objects fetched with keyset pagination"""
+
+    items: List[T] = Field(
+        ...,
+        title="Items",
+        description="Objects of the current page, in keyset order.",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        title="Next Cursor",
+        description="Opaque cursor of the next page, 'null' if this is the last page.",
+        examples=["eyJpZCI6NTB9"],
+    )
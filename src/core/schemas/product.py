@@ -1,5 +1,35 @@
-from typing import Optional, List
-from pydantic import BaseModel, ConfigDict, Field, RootModel
+from enum import Enum
+from typing import Any, Optional, List, Self
+
+from pydantic import BaseModel, ConfigDict, Field, RootModel, model_validator
+from typing_extensions import TypedDict
+
+from core.config import settings
+from .pagination import CursorPage
+
+
+class ProductSort(str, Enum):
+    """Sort order of the product list"""
+
+    ID = "id"
+    PRICE = "price"
+    PRICE_DESC = "-price"
+    NAME = "name"
+
+
+class ProductExportFormat(str, Enum):
+    """File format of the product catalog export"""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ProductBulkOperation(str, Enum):
+    """Kind of a single operation of a bulk request"""
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
 
 
 class ProductBase(BaseModel):
@@ -102,6 +132,148 @@ class ProductRead(ProductBase):
     )
 
 
+class ProductReadPage(CursorPage[ProductRead]):
+    """Schema for reading a page of products"""
+
+    pass
+
+
+class ProductRow(TypedDict):
+    """Product row serialized like ProductRead, without validation"""
+
+    name: str
+    description: str
+    price: int
+    category_id: int
+    id: int
+
+
+class ProductRowPage(TypedDict):
+    """Page of product rows serialized like ProductReadPage"""
+
+    items: List[ProductRow]
+    next_cursor: Optional[str]
+
+
+class ProductBulkUpdate(ProductUpdate):
+    """Schema for updating a product within a bulk request"""
+
+    id: int = Field(
+        ...,
+        title="Product ID",
+        description="Identifier of the product to update",
+        gt=0,
+        examples=[101],
+    )
+
+
+class ProductBulk(BaseModel):
+    """Schema for creating, updating and deleting products in one request"""
+
+    create: List[ProductCreate] = Field(
+        default_factory=list,
+        title="Create",
+        description="Products to create",
+    )
+    update: List[ProductBulkUpdate] = Field(
+        default_factory=list,
+        title="Update",
+        description="Products to replace, identified by 'id'",
+    )
+    delete: List[int] = Field(
+        default_factory=list,
+        title="Delete",
+        description="Identifiers of products to delete",
+        examples=[[101, 102]],
+    )
+
+    @model_validator(mode="after")
+    def check_batch(self) -> Self:
+        total = len(self.create) + len(self.update) + len(self.delete)
+        if total > settings.bulk.max_items:
+            raise ValueError(
+                f"A bulk request can contain at most {settings.bulk.max_items} operations"
+            )
+
+        ids = [item.id for item in self.update] + self.delete
+        if len(ids) != len(set(ids)):
+            raise ValueError("Each product ID can appear only once per bulk request")
+
+        return self
+
+
+class ProductBulkItemResult(BaseModel):
+    """Schema for the outcome of a single operation of a bulk request"""
+
+    operation: ProductBulkOperation = Field(
+        ...,
+        title="Operation",
+        description="Kind of the operation",
+    )
+    index: int = Field(
+        ...,
+        title="Index",
+        description="Position of the item in its input list",
+        examples=[0],
+    )
+    id: Optional[int] = Field(
+        default=None,
+        title="Product ID",
+        description="Identifier of the affected product, 'null' if nothing was created",
+        examples=[101],
+    )
+    detail: Optional[dict[str, Any]] = Field(
+        default=None,
+        title="Error",
+        description="Error code and reason, 'null' if the operation succeeded",
+        examples=[
+            {
+                "code": "CATEGORY_NOT_FOUND",
+                "reason": "Category with ID: '3' not found.",
+            }
+        ],
+    )
+
+
+class ProductBulkResult(BaseModel):
+    """Schema for the outcome of a bulk request"""
+
+    results: List[ProductBulkItemResult] = Field(
+        ...,
+        title="Results",
+        description="One result per operation: created, then updated, then deleted",
+    )
+
+
+class ProductImportResult(BaseModel):
+    """Schema for the outcome of a CSV catalog import"""
+
+    total: int = Field(
+        ...,
+        title="Total",
+        description="Number of data rows in the file",
+        examples=[1000000],
+    )
+    inserted: int = Field(
+        ...,
+        title="Inserted",
+        description="Number of created products",
+        examples=[999000],
+    )
+    updated: int = Field(
+        ...,
+        title="Updated",
+        description="Number of replaced products",
+        examples=[900],
+    )
+    rejected: int = Field(
+        ...,
+        title="Rejected",
+        description="Number of rows referencing a missing category",
+        examples=[100],
+    )
+
+
 from .category import CategoryReadWithProduct
 
 ProductRead.model_rebuild()
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Optional, List, Self
+from typing import Annotated, Optional, List, Self
 
 from fastapi import HTTPException, status
 from fastapi_users import schemas
@@ -9,11 +9,18 @@ from pydantic import (
     ConfigDict,
     EmailStr,
     Field,
+    PlainSerializer,
     RootModel,
     field_validator,
     model_validator,
 )
 from pydantic_core.core_schema import ValidationInfo
+from typing_extensions import TypedDict
+
+from .pagination import CursorPage
+
+DATETIME_FORMAT = "%d/%m/%Y, %H:%M:%S"
+DATE_FORMAT = "%d/%m/%Y"
 
 
 class UserProfile(BaseModel):
@@ -22,8 +29,8 @@ class UserProfile(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         json_encoders={
-            datetime: lambda v: v.strftime("%d/%m/%Y, %H:%M:%S"),
-            date: lambda v: v.strftime("%d/%m/%Y"),
+            datetime: lambda v: v.strftime(DATETIME_FORMAT),
+            date: lambda v: v.strftime(DATE_FORMAT),
         },
     )
 
@@ -142,6 +149,49 @@ class UserRead(UserProfileRead, schemas.BaseUser):
     pass
 
 
+class UserReadPage(CursorPage[UserRead]):
+    """Schema for reading a page of users."""
+
+    total_estimate: Optional[int] = Field(
+        None,
+        description="Estimated number of users matching the filters, "
+        "from planner statistics ('null' if unknown)",
+        json_schema_extra={
+            "format": "integer",
+            "readOnly": True,
+            "example": 1200,
+        },
+    )
+
+
+class UserRow(TypedDict):
+    """User row serialized like UserRead, without validation"""
+
+    id: int
+    email: str
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
+    username: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    middle_name: Optional[str]
+    birth_date: Optional[
+        Annotated[date, PlainSerializer(lambda v: v.strftime(DATE_FORMAT))]
+    ]
+    registered_on: Annotated[
+        datetime, PlainSerializer(lambda v: v.strftime(DATETIME_FORMAT))
+    ]
+
+
+class UserRowPage(TypedDict):
+    """Page of user rows serialized like UserReadPage"""
+
+    items: List[UserRow]
+    next_cursor: Optional[str]
+    total_estimate: Optional[int]
+
+
 class UserCreate(UserProfile, schemas.BaseUserCreate):
     """Schema for creating a new user."""
 
@@ -7,14 +7,56 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from core.config import settings
 from api import router as api_router
-from core.helpers import db_helper
+from api.health import router as health_router
+from api.hot_queries import HOT_QUERIES
+from api.internal import router as internal_router
+from core.authentication.access_token_cache import access_token_cache
+from core.authentication.access_token_reaper import access_token_reaper
+from core.authentication.jwt_keys import jwt_keys
+from core.authentication.password_hashing import password_hashing_pool
+from core.authentication.token_cache import verified_token_cache
+from core.helpers import (
+    db_helper,
+    category_cache,
+    pg_listener,
+    rate_limiter,
+    warm_up,
+)
+from core.middleware import (
+    CompressionMiddleware,
+    ReadYourWritesMiddleware,
+    make_compression_cache,
+    make_compression_codecs,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Load App
+    await db_helper.start()
+    password_hashing_pool.start()
+    await jwt_keys.start()
+    if settings.category_cache.enabled:
+        category_cache.start()
+    if settings.access_token.cache_enabled:
+        access_token_cache.start()
+    verified_token_cache.start()
+    await pg_listener.start()
+    await rate_limiter.start()
+    if settings.access_token_reaper.enabled:
+        await access_token_reaper.start()
+    # Last, with the keys loaded and the category cache listening
+    if settings.warm_up.enabled:
+        warm_up.start(queries=HOT_QUERIES)
     yield
     # Exit App
+    await warm_up.stop()
+    await access_token_reaper.stop()
+    await jwt_keys.stop()
+    await pg_listener.stop()
+    await rate_limiter.stop()
+    password_hashing_pool.stop()
+    await db_helper.stop()
     await db_helper.dispose()
 
 
@@ -25,6 +67,27 @@ main_app = FastAPI(
     lifespan=lifespan,
 )
 main_app.include_router(router=api_router)
+main_app.include_router(router=internal_router)
+main_app.include_router(router=health_router)
+
+
+# Send reads to the primary for a while after the client's own change
+if settings.db.replica_urls:
+    main_app.add_middleware(
+        ReadYourWritesMiddleware,
+        cookie_name=settings.db.read_your_writes_cookie,
+        window=settings.db.read_your_writes_window,
+    )
+
+# Add compression middleware
+if settings.compression.enabled:
+    main_app.add_middleware(
+        CompressionMiddleware,
+        codecs=make_compression_codecs(),
+        minimum_size=settings.compression.minimum_size,
+        cache=make_compression_cache(),
+        cache_max_body=settings.compression.cache_max_body,
+    )
 
 # Add CORS middleware
 main_app.add_middleware(